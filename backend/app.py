@@ -9,6 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from utils.network import get_local_ip, get_cors_regex
 from routes import register_routes
+from services.ffsubsync_pool import ffsubsync_pool
 
 # Configure logging
 logging.basicConfig(
@@ -37,6 +38,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Plex Dual Subtitle Manager shutting down")
+    ffsubsync_pool.close()
 
 
 def create_app() -> FastAPI:
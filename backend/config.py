@@ -2,16 +2,29 @@
 Configuration management for Plex Dual Subtitle Manager
 """
 
+import functools
 import logging
 import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import FrozenSet, List, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 logger = logging.getLogger(__name__)
 
+# Directories already created by this process; reloads only stat them
+_created_dirs = set()
+
+
+def _ensure_dir(path: Path) -> None:
+    """Create a directory, re-creating it if it was removed since"""
+    if path in _created_dirs and path.is_dir():
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    _created_dirs.add(path)
+    logger.debug(f"Created directory: {path}")
+
 
 class SubtitleConfig(BaseSettings):
     """Subtitle processing configuration"""
@@ -21,6 +34,7 @@ class SubtitleConfig(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         extra="ignore",
+        frozen=True,
     )
 
     # Language defaults
@@ -31,6 +45,12 @@ class SubtitleConfig(BaseSettings):
     enable_sync_by_default: bool = Field(True, description="Enable subtitle synchronization by default")
     sync_timeout_seconds: int = Field(120, description="Maximum time for sync operations")
     max_sync_offset_seconds: int = Field(60, description="Maximum allowed sync offset")
+    ffsubsync_pool_size: int = Field(
+        0, description="Worker processes for in-process ffsubsync in bulk jobs (0 = run the CLI per file)"
+    )
+    offset_sample_points: int = Field(
+        10, ge=1, description="Points sampled when estimating the fallback sync offset"
+    )
 
     # Font settings for ASS format
     default_font_name: str = Field("Arial", description="Default font for subtitles")
@@ -40,8 +60,8 @@ class SubtitleConfig(BaseSettings):
     secondary_color: str = Field("#FFFF00", description="Secondary subtitle color")
 
     # File processing
-    supported_subtitle_formats: List[str] = Field(
-        default_factory=lambda: ['.srt', '.ass', '.ssa', '.vtt', '.sub'],
+    supported_subtitle_formats: FrozenSet[str] = Field(
+        default_factory=lambda: frozenset({'.srt', '.ass', '.ssa', '.vtt', '.sub'}),
         description="Supported subtitle file extensions"
     )
 
@@ -58,6 +78,7 @@ class PlexConfig(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         extra="ignore",
+        frozen=True,
     )
 
     url: str = Field("http://localhost:32400", description="Plex server URL")
@@ -79,6 +100,7 @@ class AppConfig(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         extra="ignore",
+        frozen=True,
     )
 
     # API settings
@@ -112,39 +134,36 @@ class AppConfig(BaseSettings):
     @classmethod
     def create_directories(cls, v: Optional[Path]) -> Optional[Path]:
         if v:
-            v.mkdir(parents=True, exist_ok=True)
-            logger.debug(f"Created directory: {v}")
+            _ensure_dir(v)
         return v
 
 
 class Settings:
     """Singleton settings manager"""
 
-    _instance = None
-
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-
-    def __init__(self):
-        if self._initialized:
-            return
+        return get_settings()
 
+    def _load(self) -> None:
         self.app = AppConfig()
         self.plex = PlexConfig()
         self.subtitle = SubtitleConfig()
-        self._initialized = True
-        logger.debug("Settings initialized")
 
     def reload(self) -> None:
         """Reload configuration from environment and files"""
-        self.app = AppConfig()
-        self.plex = PlexConfig()
-        self.subtitle = SubtitleConfig()
+        # Reloads in place: modules hold on to the global instance
+        self._load()
         logger.info("Settings reloaded")
 
 
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the process-wide settings instance (created on first call)"""
+    instance = object.__new__(Settings)
+    instance._load()
+    logger.debug("Settings initialized")
+    return instance
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
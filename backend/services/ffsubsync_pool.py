@@ -0,0 +1,155 @@
+"""
+Persistent ffsubsync worker pool
+
+Bulk jobs sync many episodes back to back. Running the ffsubsync CLI pays
+interpreter start-up plus the numpy/ffmpeg-python imports on every call;
+these workers import ffsubsync once and then run syncs in-process.
+"""
+
+import logging
+import multiprocessing
+import threading
+from typing import Any, Dict, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _import_ffsubsync() -> None:
+    """Pool initializer: import ffsubsync once per worker process"""
+    import ffsubsync.ffsubsync  # noqa: F401
+
+
+def run_ffsubsync_inproc(
+    reference_path: str,
+    target_path: str,
+    output_path: str,
+    options: List[str]
+) -> Dict[str, Any]:
+    """Run one ffsubsync job inside a worker (same arguments as the CLI)"""
+    from ffsubsync.ffsubsync import make_parser, run
+
+    args = make_parser().parse_args(
+        [reference_path, '-i', target_path, '-o', output_path, *options]
+    )
+    result = run(args)
+    return {
+        'retval': result.get('retval', 1),
+        'offset_seconds': result.get('offset_seconds'),
+        'sync_was_successful': result.get('sync_was_successful', False),
+    }
+
+
+class FFSubsyncWorkerPool:
+    """Lazily started pool of long-lived ffsubsync worker processes"""
+
+    # Module-level callables so spawned workers can unpickle them
+    _initializer = staticmethod(_import_ffsubsync)
+    _task = staticmethod(run_ffsubsync_inproc)
+
+    def __init__(self, processes: Optional[int] = None):
+        """
+        Args:
+            processes: Number of workers; defaults to
+                settings.subtitle.ffsubsync_pool_size (0 disables the pool)
+        """
+        self._processes = processes
+        self._pool = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        # Jobs still waiting on each pool, current or retired
+        self._in_flight: Dict[Any, int] = {}
+
+    @property
+    def size(self) -> int:
+        """Configured number of worker processes"""
+        if self._processes is not None:
+            return self._processes
+        return settings.subtitle.ffsubsync_pool_size
+
+    @property
+    def enabled(self) -> bool:
+        """Whether syncs should be routed through the pool"""
+        return self.size > 0
+
+    def _acquire_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: the API process runs job threads
+                ctx = multiprocessing.get_context('spawn')
+                self._pool = ctx.Pool(processes=self.size, initializer=self._initializer)
+                logger.info(f"Started ffsubsync worker pool with {self.size} processes")
+            pool = self._pool
+            self._in_flight[pool] = self._in_flight.get(pool, 0) + 1
+            return pool
+
+    def _release_pool(self, pool) -> None:
+        with self._lock:
+            remaining = self._in_flight[pool] - 1
+            if remaining:
+                self._in_flight[pool] = remaining
+            else:
+                del self._in_flight[pool]
+                self._idle.notify_all()
+
+    def _retire_pool(self, pool) -> None:
+        """Stop routing jobs to ``pool`` and terminate it once its other jobs finish"""
+        with self._lock:
+            if self._pool is not pool:
+                return  # already retired by another timed-out job
+            self._pool = None
+        threading.Thread(
+            target=self._terminate_when_idle, args=(pool,),
+            name='ffsubsync-pool-reaper', daemon=True
+        ).start()
+
+    def _terminate_when_idle(self, pool) -> None:
+        with self._lock:
+            self._idle.wait_for(lambda: pool not in self._in_flight)
+        pool.terminate()
+        pool.join()
+        logger.info("Retired ffsubsync worker pool stopped")
+
+    def run(
+        self,
+        reference_path: str,
+        target_path: str,
+        output_path: str,
+        options: List[str],
+        timeout: float
+    ) -> Dict[str, Any]:
+        """
+        Run ffsubsync on a pooled worker and wait for the result.
+
+        Raises:
+            multiprocessing.TimeoutError: If the job exceeds ``timeout``. New
+                jobs go to a fresh pool; the old one keeps serving the jobs
+                already on it and is terminated once they finish, which also
+                frees the runaway worker's slot.
+        """
+        pool = self._acquire_pool()
+        try:
+            async_result = pool.apply_async(
+                self._task,
+                (reference_path, target_path, output_path, options)
+            )
+            return async_result.get(timeout=timeout)
+        except multiprocessing.TimeoutError:
+            self._retire_pool(pool)
+            raise
+        finally:
+            self._release_pool(pool)
+
+    def close(self) -> None:
+        """Terminate the worker processes (restarted on next use)"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+            logger.info("ffsubsync worker pool stopped")
+
+
+# Global pool instance, started on first bulk sync
+ffsubsync_pool = FFSubsyncWorkerPool()
@@ -8,11 +8,12 @@ import logging
 import threading
 import traceback
 import uuid
+from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
@@ -124,6 +125,8 @@ class JobQueue:
 
     def __init__(self, max_concurrent_jobs: int = 2):
         self.jobs: Dict[str, Job] = {}
+        # Job ids per status, so filtered lookups don't scan every job
+        self._by_status: Dict[JobStatus, Set[str]] = defaultdict(set)
         self.max_concurrent_jobs = max_concurrent_jobs
         self.executor = ThreadPoolExecutor(max_workers=max_concurrent_jobs)
         self._lock = threading.Lock()
@@ -158,10 +161,17 @@ class JobQueue:
         
         with self._lock:
             self.jobs[job_id] = job
+            self._by_status[job.status].add(job_id)
 
         logger.info(f"Job created: {job_id} ({job_type.value}) - {title}")
         return job_id
     
+    def _set_status(self, job: Job, status: JobStatus):
+        """Move a job to a new status and status bucket (caller holds self._lock)"""
+        self._by_status[job.status].discard(job.id)
+        self._by_status[status].add(job.id)
+        job.status = status
+
     def get_job(self, job_id: str) -> Optional[Job]:
         """Get job by ID"""
         with self._lock:
@@ -170,10 +180,10 @@ class JobQueue:
     def get_all_jobs(self, status_filter: Optional[JobStatus] = None) -> List[Job]:
         """Get all jobs, optionally filtered by status"""
         with self._lock:
-            jobs = list(self.jobs.values())
-            
-        if status_filter:
-            jobs = [job for job in jobs if job.status == status_filter]
+            if status_filter:
+                jobs = [self.jobs[job_id] for job_id in self._by_status[status_filter]]
+            else:
+                jobs = list(self.jobs.values())
             
         # Sort by created date, newest first
         return sorted(jobs, key=lambda j: j.created_at, reverse=True)
@@ -181,10 +191,8 @@ class JobQueue:
     def get_active_jobs(self) -> List[Job]:
         """Get all pending and running jobs"""
         with self._lock:
-            return [
-                job for job in self.jobs.values() 
-                if job.status in [JobStatus.PENDING, JobStatus.RUNNING]
-            ]
+            active_ids = self._by_status[JobStatus.PENDING] | self._by_status[JobStatus.RUNNING]
+            return [self.jobs[job_id] for job_id in active_ids]
     
     def start_job(self, job_id: str, job_func: Callable, *args, **kwargs) -> bool:
         """Start executing a job"""
@@ -198,11 +206,11 @@ class JobQueue:
                 return False
                 
             # Check if we have capacity for another job
-            running_count = len([j for j in self.jobs.values() if j.status == JobStatus.RUNNING])
+            running_count = len(self._by_status[JobStatus.RUNNING])
             if running_count >= self.max_concurrent_jobs:
                 return False
                 
-            job.status = JobStatus.RUNNING
+            self._set_status(job, JobStatus.RUNNING)
             job.started_at = datetime.now()
 
         logger.info(f"Job started: {job_id} - {job.title}")
@@ -262,7 +270,7 @@ class JobQueue:
         with self._lock:
             job = self.jobs.get(job_id)
             if job:
-                job.status = JobStatus.COMPLETED
+                self._set_status(job, JobStatus.COMPLETED)
                 job.completed_at = datetime.now()
                 job.result = result
                 job.progress.percentage = 100.0
@@ -279,7 +287,7 @@ class JobQueue:
         with self._lock:
             job = self.jobs.get(job_id)
             if job:
-                job.status = JobStatus.FAILED
+                self._set_status(job, JobStatus.FAILED)
                 job.completed_at = datetime.now()
                 job.error = error
                 job.progress.current_step = "Failed"
@@ -298,7 +306,7 @@ class JobQueue:
                 return False
                 
             if job.status == JobStatus.PENDING:
-                job.status = JobStatus.CANCELLED
+                self._set_status(job, JobStatus.CANCELLED)
                 job.completed_at = datetime.now()
                 job.progress.current_step = "Cancelled"
                 logger.info(f"Job cancelled (pending): {job_id}")
@@ -313,7 +321,7 @@ class JobQueue:
                 if future:
                     cancelled = future.cancel()
                     if cancelled:
-                        job.status = JobStatus.CANCELLED
+                        self._set_status(job, JobStatus.CANCELLED)
                         job.completed_at = datetime.now()
                         job.progress.current_step = "Cancelled"
                         del job.metadata['future']
@@ -339,7 +347,7 @@ class JobQueue:
         with self._lock:
             job = self.jobs.get(job_id)
             if job and job.status == JobStatus.RUNNING:
-                job.status = JobStatus.CANCELLED
+                self._set_status(job, JobStatus.CANCELLED)
                 job.completed_at = datetime.now()
                 job.progress.current_step = "Cancelled"
                 # Clean up future reference
@@ -361,7 +369,8 @@ class JobQueue:
                         to_remove.append(job_id)
             
             for job_id in to_remove:
-                del self.jobs[job_id]
+                job = self.jobs.pop(job_id)
+                self._by_status[job.status].discard(job_id)
 
         if to_remove:
             logger.info(f"Cleaned up {len(to_remove)} old jobs")
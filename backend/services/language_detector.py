@@ -2,19 +2,24 @@
 Simplified language detection for subtitle files
 """
 
+import dataclasses
+import functools
 import logging
+import os
 import re
+from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-import chardet
 import pysubs2
 from langdetect import detect, LangDetectException
 
 from config import settings
 from exceptions import LanguageDetectionError, SubtitleEncodingError
+from utils.compat import DATACLASS_SLOTS
+from utils.encoding import detect_file_encoding
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +40,103 @@ class Language(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# Language code aliases (lowercase) -> Language
+_ALIAS_TO_LANG: Dict[str, Language] = {
+    'en': Language.ENGLISH,
+    'eng': Language.ENGLISH,
+    'english': Language.ENGLISH,
+    'ja': Language.JAPANESE,
+    'jpn': Language.JAPANESE,
+    'japanese': Language.JAPANESE,
+    'zh': Language.CHINESE_SIMPLIFIED,
+    'zh-cn': Language.CHINESE_SIMPLIFIED,
+    'chi': Language.CHINESE_SIMPLIFIED,
+    'chinese': Language.CHINESE_SIMPLIFIED,
+    'simplified': Language.CHINESE_SIMPLIFIED,
+    'zh-tw': Language.CHINESE_TRADITIONAL,
+    'zh-hk': Language.CHINESE_TRADITIONAL,
+    'traditional': Language.CHINESE_TRADITIONAL,
+    'ko': Language.KOREAN,
+    'kor': Language.KOREAN,
+    'korean': Language.KOREAN,
+    'fr': Language.FRENCH,
+    'fra': Language.FRENCH,
+    'french': Language.FRENCH,
+    'es': Language.SPANISH,
+    'spa': Language.SPANISH,
+    'spanish': Language.SPANISH,
+    'de': Language.GERMAN,
+    'ger': Language.GERMAN,
+    'deu': Language.GERMAN,
+    'german': Language.GERMAN,
+    'ru': Language.RUSSIAN,
+    'rus': Language.RUSSIAN,
+    'russian': Language.RUSSIAN,
+    'it': Language.ITALIAN,
+    'ita': Language.ITALIAN,
+    'italian': Language.ITALIAN,
+    'pt': Language.PORTUGUESE,
+    'por': Language.PORTUGUESE,
+    'portuguese': Language.PORTUGUESE,
+}
+
+
+# Script buckets for quick language identification. Each bucket's characters
+# are translated to one private-use marker so a single Counter pass scores
+# every script.
+_SCRIPT_RANGES = (
+    ('\ue000', ((0x3040, 0x309f), (0x30a0, 0x30ff))),  # Hiragana & Katakana
+    ('\ue001', ((0xac00, 0xd7af), (0x1100, 0x11ff))),  # Hangul
+    ('\ue002', ((0x4e00, 0x9fff),)),                   # CJK (needs further analysis)
+    ('\ue003', ((0x0400, 0x04ff),)),                   # Cyrillic
+)
+
+# Marker counted for each language, in tie-break order (CJK scores both Chinese variants)
+_SCRIPT_MARKERS = (
+    (Language.JAPANESE, '\ue000'),
+    (Language.KOREAN, '\ue001'),
+    (Language.CHINESE_SIMPLIFIED, '\ue002'),
+    (Language.CHINESE_TRADITIONAL, '\ue002'),
+    (Language.RUSSIAN, '\ue003'),
+)
+
+
+def _build_script_table() -> Dict[int, Optional[str]]:
+    """Build the str.translate table mapping script characters to bucket markers"""
+    # Markers that already occur in the text are dropped so they can't be miscounted
+    table: Dict[int, Optional[str]] = {ord(marker): None for marker, _ in _SCRIPT_RANGES}
+    for marker, ranges in _SCRIPT_RANGES:
+        for start, end in ranges:
+            table.update(dict.fromkeys(range(start, end + 1), marker))
+    return table
+
+
+_SCRIPT_TABLE = _build_script_table()
+
+# ASS override blocks and HTML tags, stripped from sample text
+_TAG_RE = re.compile(r'\{[^}]*\}|<[^>]*>')
+
+_TRADITIONAL_INDICATORS = frozenset('繁體國際電腦網絡軟體記憶體處理器圖畫機器學習訓練測試數據庫連線')
+_SIMPLIFIED_INDICATORS = frozenset('简体国际电脑网络软体记忆体处理器图画机器学习训练测试数据库连线')
+
+# Variant indicators folded to markers, as for scripts; characters in both
+# sets get their own marker and count towards each variant
+_TRADITIONAL_MARKER, _SIMPLIFIED_MARKER, _SHARED_MARKER = '\ue010', '\ue011', '\ue012'
+_VARIANT_TABLE: Dict[int, Optional[str]] = {
+    **{ord(marker): None for marker in (_TRADITIONAL_MARKER, _SIMPLIFIED_MARKER, _SHARED_MARKER)},
+    **{ord(char): _TRADITIONAL_MARKER for char in _TRADITIONAL_INDICATORS},
+    **{ord(char): _SIMPLIFIED_MARKER for char in _SIMPLIFIED_INDICATORS},
+    **{ord(char): _SHARED_MARKER for char in _TRADITIONAL_INDICATORS & _SIMPLIFIED_INDICATORS},
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _normalize_cached(lang_code: str) -> Language:
+    """Alias lookup behind _normalize_language_code, cached per raw code"""
+    return _ALIAS_TO_LANG.get(lang_code.lower().strip(), Language.UNKNOWN)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class LanguageDetectionResult:
     """Result of language detection"""
     detected_language: Language
@@ -49,31 +150,21 @@ class LanguageDetectionResult:
 class SimpleLanguageDetector:
     """Simplified language detector using multiple strategies"""
     
-    # Regex patterns for quick language identification
-    PATTERNS = {
-        Language.JAPANESE: re.compile(r'[\u3040-\u309f\u30a0-\u30ff]'),  # Hiragana & Katakana
-        Language.KOREAN: re.compile(r'[\uac00-\ud7af\u1100-\u11ff]'),     # Hangul
-        Language.CHINESE_SIMPLIFIED: re.compile(r'[\u4e00-\u9fff]'),      # CJK (needs further analysis)
-        Language.CHINESE_TRADITIONAL: re.compile(r'[\u4e00-\u9fff]'),     # CJK (needs further analysis)
-        Language.RUSSIAN: re.compile(r'[\u0400-\u04ff]'),                 # Cyrillic
-    }
-    
     # Characters more common in Traditional Chinese
-    TRADITIONAL_INDICATORS = set('繁體國際電腦網絡軟體記憶體處理器圖畫機器學習訓練測試數據庫連線')
+    TRADITIONAL_INDICATORS = _TRADITIONAL_INDICATORS
     # Characters more common in Simplified Chinese
-    SIMPLIFIED_INDICATORS = set('简体国际电脑网络软体记忆体处理器图画机器学习训练测试数据库连线')
+    SIMPLIFIED_INDICATORS = _SIMPLIFIED_INDICATORS
     
     def __init__(self):
         self.min_sample_size = 100  # Minimum characters for reliable detection
         self.max_sample_lines = 50  # Maximum subtitle lines to sample
+        # Detection results per (path, mtime, size, declared language)
+        self._detect_cached = functools.lru_cache(maxsize=1024)(self._detect_from_file_key)
     
     def detect_encoding(self, file_path: Path) -> str:
         """Detect file encoding"""
         try:
-            with open(file_path, 'rb') as f:
-                raw_data = f.read()
-                result = chardet.detect(raw_data)
-                return result['encoding'] or 'utf-8'
+            return detect_file_encoding(file_path)
         except Exception as e:
             raise SubtitleEncodingError(str(file_path))
     
@@ -99,6 +190,33 @@ class SimpleLanguageDetector:
                 method_used="config_disabled"
             )
         
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            # Let the uncached path report the missing file as usual
+            return self._detect_from_file_uncached(file_path, declared_lang)
+        
+        result = self._detect_cached(str(file_path), st.st_mtime_ns, st.st_size, declared_lang)
+        # Hand out a copy so callers can't alter the cached result
+        return dataclasses.replace(
+            result, details=dict(result.details) if result.details is not None else None
+        )
+    
+    def clear_cache(self) -> None:
+        """Forget memoized detection results"""
+        self._detect_cached.cache_clear()
+    
+    def _detect_from_file_key(
+        self, path: str, mtime_ns: int, size: int, declared_lang: Optional[str]
+    ) -> LanguageDetectionResult:
+        """Cache entry point; mtime and size only serve as the cache key"""
+        return self._detect_from_file_uncached(Path(path), declared_lang)
+    
+    def _detect_from_file_uncached(
+        self, file_path: Path, declared_lang: Optional[str]
+    ) -> LanguageDetectionResult:
+        """Run detection on the file contents"""
+        
         try:
             # Load subtitle file
             encoding = self.detect_encoding(file_path)
@@ -146,29 +264,21 @@ class SimpleLanguageDetector:
         """Extract representative sample text from subtitles"""
         
         # Sample from different parts of the file for better representation
-        total_lines = len(subs)
-        sample_indices = []
+        events = subs.events
+        total_lines = len(events)
         
         if total_lines <= self.max_sample_lines:
             # Use all lines if file is small
-            sample_indices = list(range(total_lines))
+            sampled = events
         else:
             # Sample evenly across the file
             step = total_lines // self.max_sample_lines
-            sample_indices = list(range(0, total_lines, step))[:self.max_sample_lines]
-        
-        # Extract and clean text
-        sample_lines = []
-        for idx in sample_indices:
-            if idx < total_lines:
-                text = subs[idx].text
-                # Remove formatting tags
-                text = re.sub(r'\{[^}]*\}', '', text)  # ASS tags
-                text = re.sub(r'<[^>]*>', '', text)    # HTML tags
-                text = re.sub(r'\\N', ' ', text)       # Line breaks
-                sample_lines.append(text)
+            sampled = events[::step][:self.max_sample_lines]
         
-        return ' '.join(sample_lines)
+        # Strip formatting tags per event so an unmatched '<' or '{' in one
+        # line can never pair with a closer in a later line
+        text = ' '.join(_TAG_RE.sub('', event.text) for event in sampled)
+        return text.replace('\\N', ' ')
     
     def _detect_with_multiple_strategies(self, text: str, declared_lang: Optional[str]) -> LanguageDetectionResult:
         """Use multiple strategies to detect language"""
@@ -230,10 +340,11 @@ class SimpleLanguageDetector:
         matches = {}
         total_chars = len(text.replace(' ', ''))
         
-        for lang, pattern in self.PATTERNS.items():
-            found = pattern.findall(text)
-            if found:
-                matches[lang] = len(''.join(found))
+        # One pass: fold every script character into its bucket marker and count
+        counts = Counter(text.translate(_SCRIPT_TABLE))
+        for lang, marker in _SCRIPT_MARKERS:
+            if counts[marker]:
+                matches[lang] = counts[marker]
         
         if not matches:
             return None
@@ -245,8 +356,7 @@ class SimpleLanguageDetector:
         
         # Special handling for Chinese variants
         if dominant_lang in [Language.CHINESE_SIMPLIFIED, Language.CHINESE_TRADITIONAL]:
-            trad_count = sum(1 for char in text if char in self.TRADITIONAL_INDICATORS)
-            simp_count = sum(1 for char in text if char in self.SIMPLIFIED_INDICATORS)
+            trad_count, simp_count = self._count_variant_indicators(text)
             
             if trad_count > simp_count:
                 dominant_lang = Language.CHINESE_TRADITIONAL
@@ -310,11 +420,16 @@ class SimpleLanguageDetector:
         except LangDetectException:
             return None
     
+    def _count_variant_indicators(self, text: str) -> Tuple[int, int]:
+        """Count Traditional and Simplified indicator characters in one pass"""
+        counts = Counter(text.translate(_VARIANT_TABLE))
+        shared = counts[_SHARED_MARKER]
+        return counts[_TRADITIONAL_MARKER] + shared, counts[_SIMPLIFIED_MARKER] + shared
+    
     def _refine_chinese_detection(self, text: str, initial_result: LanguageDetectionResult) -> LanguageDetectionResult:
         """Refine detection between Simplified and Traditional Chinese"""
         
-        trad_count = sum(1 for char in text if char in self.TRADITIONAL_INDICATORS)
-        simp_count = sum(1 for char in text if char in self.SIMPLIFIED_INDICATORS)
+        trad_count, simp_count = self._count_variant_indicators(text)
         
         if trad_count > simp_count * 1.5:  # Strong Traditional indicator
             initial_result.detected_language = Language.CHINESE_TRADITIONAL
@@ -340,46 +455,4 @@ class SimpleLanguageDetector:
         if not lang_code:
             return Language.UNKNOWN
         
-        lang_code = lang_code.lower().strip()
-        
-        # Direct mapping
-        direct_map = {
-            'en': Language.ENGLISH,
-            'eng': Language.ENGLISH,
-            'english': Language.ENGLISH,
-            'ja': Language.JAPANESE,
-            'jpn': Language.JAPANESE,
-            'japanese': Language.JAPANESE,
-            'zh': Language.CHINESE_SIMPLIFIED,
-            'zh-cn': Language.CHINESE_SIMPLIFIED,
-            'chi': Language.CHINESE_SIMPLIFIED,
-            'chinese': Language.CHINESE_SIMPLIFIED,
-            'simplified': Language.CHINESE_SIMPLIFIED,
-            'zh-tw': Language.CHINESE_TRADITIONAL,
-            'zh-hk': Language.CHINESE_TRADITIONAL,
-            'traditional': Language.CHINESE_TRADITIONAL,
-            'ko': Language.KOREAN,
-            'kor': Language.KOREAN,
-            'korean': Language.KOREAN,
-            'fr': Language.FRENCH,
-            'fra': Language.FRENCH,
-            'french': Language.FRENCH,
-            'es': Language.SPANISH,
-            'spa': Language.SPANISH,
-            'spanish': Language.SPANISH,
-            'de': Language.GERMAN,
-            'ger': Language.GERMAN,
-            'deu': Language.GERMAN,
-            'german': Language.GERMAN,
-            'ru': Language.RUSSIAN,
-            'rus': Language.RUSSIAN,
-            'russian': Language.RUSSIAN,
-            'it': Language.ITALIAN,
-            'ita': Language.ITALIAN,
-            'italian': Language.ITALIAN,
-            'pt': Language.PORTUGUESE,
-            'por': Language.PORTUGUESE,
-            'portuguese': Language.PORTUGUESE,
-        }
-        
-        return direct_map.get(lang_code, Language.UNKNOWN)
\ No newline at end of file
+        return _normalize_cached(lang_code)
@@ -2,13 +2,17 @@
 Subtitle Service - handles subtitle file operations and dual subtitle creation
 """
 
+import io
 import logging
+import re
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
-import chardet
 import ffmpeg
+import numpy as np
 import pysubs2
+from pysubs2.formats import autodetect_format
+from pysubs2.time import TIMESTAMP, timestamp_to_ms
 
 from .subtitle_config import DualSubtitleConfig
 from .subtitle_sync import (
@@ -18,9 +22,125 @@ from .subtitle_sync import (
     SyncReport,
 )
 from .language_detector import SimpleLanguageDetector
+from utils.encoding import (
+    clear_encoding_cache,
+    decode_subtitle_bytes,
+    detect_file_encoding,
+    detect_stream_encoding,
+)
 
 logger = logging.getLogger(__name__)
 
+# Below this many primary x secondary pairs the plain nested scan is cheaper
+# than building the NumPy arrays for the sorted sweep.
+OVERLAP_SWEEP_MIN_PAIRS = 100_000
+
+# Subtitles already this close to the video are not worth an ffsubsync run
+ALIGNED_DURATION_TOLERANCE_MS = 2000
+ALIGNED_FIRST_CUE_TOLERANCE_MS = 1000
+
+# pysubs2's SubRip reader, precompiled (it looks patterns up per event)
+_SRT_BLANK_LINE = re.compile(r"\s*$")
+_SRT_INDEX_LINE = re.compile(r"\s*\d+\s*$")
+_SRT_TRAILING_INDEX = re.compile(r"\n+ *\d+ *$")
+_SRT_HTML_TAGS = tuple(
+    (re.compile(pattern), replacement) for pattern, replacement in (
+        (r"< *i *>", r"{\\i1}"), (r"< */ *i *>", r"{\\i0}"),
+        (r"< *s *>", r"{\\s1}"), (r"< */ *s *>", r"{\\s0}"),
+        (r"< *u *>", r"{\\u1}"), (r"< */ *u *>", r"{\\u0}"),
+        (r"< *b *>", r"{\\b1}"), (r"< */ *b *>", r"{\\b0}"),
+        (r"< */? *[a-zA-Z][^>]*>", ""),
+    )
+)
+
+
+def _first_primary_overlaps(primary_subs, secondary_subs) -> Optional[List[int]]:
+    """
+    Find, for each secondary line, the first primary line overlapping it.
+
+    Uses a sorted sweep (running max of end times + binary search), so the
+    cost is O((N + M) log N) instead of O(N * M).
+
+    Returns:
+        List of primary indices (-1 where nothing overlaps), or None if the
+        primary lines are not sorted by start time.
+    """
+    p_start = np.fromiter((line.start for line in primary_subs), dtype=np.int64, count=len(primary_subs))
+    p_end = np.fromiter((line.end for line in primary_subs), dtype=np.int64, count=len(primary_subs))
+    s_start = np.fromiter((line.start for line in secondary_subs), dtype=np.int64, count=len(secondary_subs))
+    s_end = np.fromiter((line.end for line in secondary_subs), dtype=np.int64, count=len(secondary_subs))
+
+    if p_start.size == 0:
+        return [-1] * s_start.size
+    if np.any(p_start[1:] < p_start[:-1]):
+        return None
+
+    # First primary whose end reaches the secondary start; with starts sorted
+    # it is the only candidate that can be the first overlap.
+    idx = np.searchsorted(np.maximum.accumulate(p_end), s_start, side='left')
+    candidate = np.minimum(idx, p_start.size - 1)
+    hit = (idx < p_start.size) & (p_start[candidate] <= s_end)
+    return np.where(hit, idx, -1).tolist()
+
+
+def _srt_event_text(lines: List[str]) -> str:
+    """Build one event's text exactly as pysubs2's SubRip reader does."""
+    if (len(lines) >= 2
+            and all(_SRT_BLANK_LINE.match(line) for line in lines[:-1])
+            and _SRT_INDEX_LINE.match(lines[-1])):
+        return ""
+
+    text = _SRT_TRAILING_INDEX.sub("", "".join(lines).strip())
+    # Every tag pattern starts with '<', so plain lines skip all of them
+    if "<" in text:
+        for pattern, replacement in _SRT_HTML_TAGS:
+            text = pattern.sub(replacement, text)
+    return text.replace("\n", "\\N")
+
+
+def _parse_srt(text: str) -> pysubs2.SSAFile:
+    """
+    Parse SubRip text into the same SSAFile pysubs2.load would return.
+
+    Mirrors pysubs2's reader line for line, but with precompiled patterns
+    and no tag rewriting for lines without markup, which is most of them.
+    """
+    timestamps = []
+    following_lines = []
+    for line in io.StringIO(text):
+        stamps = TIMESTAMP.findall(line)
+        if len(stamps) == 2:
+            timestamps.append((timestamp_to_ms(stamps[0]), timestamp_to_ms(stamps[1])))
+            following_lines.append([])
+        elif timestamps:
+            following_lines[-1].append(line)
+
+    subs = pysubs2.SSAFile()
+    subs.format = "srt"
+    subs.events = [
+        pysubs2.SSAEvent(start=start, end=end, text=_srt_event_text(lines))
+        for (start, end), lines in zip(timestamps, following_lines)
+    ]
+    return subs
+
+
+def _subs_from_text(text: str) -> pysubs2.SSAFile:
+    """Parse decoded subtitle text, using the SRT fast path when it applies."""
+    # Same format detection as pysubs2.load, so mislabelled files still go
+    # through the matching pysubs2 reader
+    format_ = autodetect_format(text[:10000])
+    if format_ == 'srt':
+        return _parse_srt(text)
+    return pysubs2.SSAFile.from_string(text, format_=format_)
+
+
+def _format_preview_time(ms: int) -> str:
+    """Format milliseconds as H:MM:SS (same output as pysubs2.time.ms_to_str)."""
+    sign = "-" if ms < 0 else ""
+    h, rem = divmod(abs(int(ms)), 3_600_000)
+    m, rem = divmod(rem, 60_000)
+    return f"{sign}{h:d}:{m:02d}:{rem // 1000:02d}"
+
 
 class SubtitleService:
     """Service for subtitle file operations and dual subtitle creation."""
@@ -72,12 +192,20 @@ class SubtitleService:
             )
 
         # Validate sync with video
-        sync_warnings = self._validate_sync(primary_path, secondary_path, video_path)
+        sync_warnings, sync_margins = self._validate_sync(primary_path, secondary_path, video_path)
+
+        # Skip the (slow) sync entirely when both subtitles already line up
+        skip_sync = sync_enabled and not sync_warnings and self._is_already_aligned(sync_margins)
+        if skip_sync:
+            logger.info("Subtitles already aligned with video, skipping sync")
+            sync_enabled = False
 
         # Prepare synced subtitles
         actual_primary, actual_secondary, sync_report = prepare_synced_subtitles(
             primary_path, secondary_path, video_path, sync_enabled
         )
+        if skip_sync:
+            sync_report.method = 'skipped-already-aligned'
 
         try:
             # Create the dual subtitle in SRT format
@@ -106,7 +234,8 @@ class SubtitleService:
             # Cleanup temp files
             cleanup_temp_files(
                 [actual_primary, actual_secondary],
-                [primary_path, secondary_path]
+                [primary_path, secondary_path],
+                sync_report.temp_dir
             )
 
     def _create_srt(
@@ -121,7 +250,7 @@ class SubtitleService:
             primary_subs = self.load_subtitle(primary_path)
             secondary_subs = self.load_subtitle(secondary_path)
 
-            dual_subs = pysubs2.SSAFile()
+            primary_lines = len(primary_subs)
 
             # Determine prefixes based on enable_language_prefix setting
             primary_prefix = ""
@@ -132,30 +261,54 @@ class SubtitleService:
                 primary_prefix = f"[{primary_lang}] "
                 secondary_prefix = f"[{secondary_lang}] "
 
-            # Add primary with optional prefix
-            for line in primary_subs:
-                text = primary_prefix + line.text if primary_prefix else line.text
-
-                event = pysubs2.SSAEvent(
-                    start=line.start,
-                    end=line.end,
-                    text=text
-                )
-                dual_subs.append(event)
+            # Build the output in the freshly loaded primary file instead of
+            # copying every event into a new one. Source styles and comment
+            # flags are reset so the SRT writer sees plain default lines.
+            dual_subs = primary_subs
+            dual_subs.styles = pysubs2.SSAFile().styles
+            for line in dual_subs:
+                line.style = "Default"
+                line.type = "Dialogue"
+            if primary_prefix:
+                for line in dual_subs:
+                    line.text = f"{primary_prefix}{line.text}"
 
             # Add secondary, merging overlaps
-            for line in secondary_subs:
-                text = secondary_prefix + line.text if secondary_prefix else line.text
-
-                # Check for overlaps
-                merged = False
-                for existing in dual_subs:
-                    if self._times_overlap(line, existing):
-                        existing.text = f"{existing.text}\\N{text}"
-                        merged = True
-                        break
-
-                if not merged:
+            events = dual_subs.events
+            primary_count = len(events)
+            first_overlap = None
+            if primary_count * len(secondary_subs) > OVERLAP_SWEEP_MIN_PAIRS:
+                first_overlap = _first_primary_overlaps(primary_subs, secondary_subs)
+
+            if secondary_prefix:
+                secondary_texts = [f"{secondary_prefix}{line.text}" for line in secondary_subs]
+            else:
+                secondary_texts = [line.text for line in secondary_subs]
+
+            for i, line in enumerate(secondary_subs):
+                text = secondary_texts[i]
+
+                # Primary matches are precomputed for large files, so only the
+                # secondary lines appended so far still need scanning
+                if first_overlap is not None:
+                    match = first_overlap[i]
+                    scan_from = primary_count
+                else:
+                    match = -1
+                    scan_from = 0
+
+                # Check for overlaps (inlined _times_overlap, this is the hot loop)
+                if match < 0:
+                    for j in range(scan_from, len(events)):
+                        existing = events[j]
+                        if line.start <= existing.end and line.end >= existing.start:
+                            match = j
+                            break
+
+                if match >= 0:
+                    existing = events[match]
+                    existing.text = f"{existing.text}\\N{text}"
+                else:
                     dual_subs.append(pysubs2.SSAEvent(
                         start=line.start,
                         end=line.end,
@@ -168,7 +321,7 @@ class SubtitleService:
             return {
                 'success': True,
                 'output_path': output_path,
-                'primary_lines': len(primary_subs),
+                'primary_lines': primary_lines,
                 'secondary_lines': len(secondary_subs),
                 'total_lines': len(dual_subs),
                 'format': 'SRT'
@@ -221,11 +374,18 @@ class SubtitleService:
         primary_path: str,
         secondary_path: str,
         video_path: Optional[str]
-    ) -> List[str]:
-        """Validate subtitle sync with video."""
+    ) -> Tuple[List[str], Optional[Dict[str, int]]]:
+        """
+        Validate subtitle sync with video.
+
+        Returns:
+            Tuple of (warnings, margins). margins holds the worst
+            'duration_delta_ms' against the video and the 'first_cue_delta_ms'
+            between the two subtitles; None unless both subtitles validated.
+        """
         warnings = []
         if not video_path:
-            return warnings
+            return warnings, None
 
         primary_sync = self.validate_subtitle_sync(primary_path, video_path)
         secondary_sync = self.validate_subtitle_sync(secondary_path, video_path)
@@ -238,33 +398,110 @@ class SubtitleService:
             msg = secondary_sync.get('warning') or secondary_sync.get('error')
             warnings.append(f"Secondary subtitle sync issue: {msg}")
 
-        return warnings
+        if warnings:
+            return warnings, None
+
+        video_duration = primary_sync['video_duration_ms']
+        margins = {
+            'duration_delta_ms': max(
+                abs(primary_sync['subtitle_duration_ms'] - video_duration),
+                abs(secondary_sync['subtitle_duration_ms'] - video_duration),
+            ),
+            'first_cue_delta_ms': abs(
+                primary_sync['first_start_ms'] - secondary_sync['first_start_ms']
+            ),
+        }
+        return warnings, margins
+
+    def _is_already_aligned(self, margins: Optional[Dict[str, int]]) -> bool:
+        """Check whether validated sync margins are small enough to skip syncing."""
+        if not margins:
+            return False
+        return (
+            margins['duration_delta_ms'] <= ALIGNED_DURATION_TOLERANCE_MS and
+            margins['first_cue_delta_ms'] < ALIGNED_FIRST_CUE_TOLERANCE_MS
+        )
 
     # =========================================================================
     # Utility methods
     # =========================================================================
 
-    def detect_encoding(self, file_path: str) -> str:
-        """Detect character encoding of a subtitle file."""
-        with open(file_path, 'rb') as f:
-            raw_data = f.read()
-            result = chardet.detect(raw_data)
-            return result['encoding'] or 'utf-8'
+    def detect_encoding(self, file_path: Union[str, Path, bytes]) -> str:
+        """Detect character encoding of a subtitle file or in-memory content."""
+        if isinstance(file_path, bytes):
+            return detect_stream_encoding(io.BytesIO(file_path))
+        return detect_file_encoding(file_path)
+
+    def clear_detection_caches(self) -> None:
+        """Drop memoized encoding and language detection results."""
+        clear_encoding_cache()
+        self.language_detector.clear_cache()
 
     def load_subtitle(
         self,
-        file_path: str,
+        file_path: Union[str, Path, bytes],
         encoding: Optional[str] = None
     ) -> pysubs2.SSAFile:
-        """Load subtitle file with automatic encoding detection."""
+        """
+        Load subtitle file with automatic encoding detection.
+
+        Raw file content (e.g. an upload) may be passed as bytes instead of a
+        path, so it never has to round-trip through a temp file.
+        """
         if not encoding:
             encoding = self.detect_encoding(file_path)
 
+        if isinstance(file_path, bytes):
+            try:
+                return _subs_from_text(decode_subtitle_bytes(file_path, encoding))
+            except Exception:
+                return _subs_from_text(decode_subtitle_bytes(file_path, 'utf-8', 'replace'))
+
         try:
-            return pysubs2.load(file_path, encoding=encoding)
+            if Path(file_path).suffix.lower() != '.srt':
+                return pysubs2.load(file_path, encoding=encoding)
+
+            with open(file_path, encoding=encoding) as f:
+                return _subs_from_text(f.read())
         except Exception:
             return pysubs2.load(file_path, encoding='utf-8', errors='replace')
 
+    def adjust_subtitle_timing(
+        self,
+        file_path: str,
+        offset_ms: int,
+        output_path: Optional[str] = None,
+        encoding: Optional[str] = None
+    ) -> Dict:
+        """Shift all subtitle timings by a fixed offset, clamping at zero."""
+        try:
+            subs = self.load_subtitle(file_path, encoding)
+            count = len(subs)
+
+            # Shift every timing at once rather than per event
+            starts = np.fromiter((line.start for line in subs), dtype=np.int64, count=count)
+            ends = np.fromiter((line.end for line in subs), dtype=np.int64, count=count)
+            np.clip(starts + offset_ms, 0, None, out=starts)
+            np.clip(ends + offset_ms, 0, None, out=ends)
+
+            for line, start, end in zip(subs, starts.tolist(), ends.tolist()):
+                line.start = start
+                line.end = end
+
+            output_path = output_path or file_path
+            subs.save(output_path)
+
+            return {
+                'success': True,
+                'output_path': output_path,
+                'offset_applied_ms': offset_ms,
+                'lines_adjusted': count,
+            }
+
+        except Exception as e:
+            logger.error(f"Timing adjustment failed: {e}")
+            return {'success': False, 'error': str(e)}
+
     def get_video_duration_ms(self, video_path: str) -> Optional[int]:
         """Get video duration in milliseconds using ffmpeg."""
         try:
@@ -291,6 +528,7 @@ class SubtitleService:
                 return {'valid': False, 'error': 'No subtitles found'}
 
             last_end = max(line.end for line in subs)
+            first_start = min(line.start for line in subs)
 
             if last_end > video_duration + 5000:
                 return {
@@ -311,7 +549,8 @@ class SubtitleService:
             return {
                 'valid': True,
                 'subtitle_duration_ms': last_end,
-                'video_duration_ms': video_duration
+                'video_duration_ms': video_duration,
+                'first_start_ms': first_start,
             }
 
         except Exception as e:
@@ -378,7 +617,7 @@ class SubtitleService:
                 if i >= limit:
                     break
                 preview.append({
-                    'time': f"{pysubs2.time.ms_to_str(line.start)} --> {pysubs2.time.ms_to_str(line.end)}",
+                    'time': f"{_format_preview_time(line.start)} --> {_format_preview_time(line.end)}",
                     'text': line.text
                 })
             return preview
@@ -5,6 +5,8 @@ Handles syncing subtitles to video or to each other using ffsubsync.
 """
 
 import logging
+import os
+import shutil
 import subprocess
 import tempfile
 from dataclasses import dataclass, field
@@ -27,6 +29,7 @@ class SyncReport:
     secondary_synced: bool = False
     method: Optional[str] = None
     error: Optional[str] = None
+    temp_dir: Optional[str] = None
 
 
 def sync_subtitles_hybrid(
@@ -266,13 +269,12 @@ def _sync_to_video(
     actual_primary_path = primary_path
     actual_secondary_path = secondary_path
 
-    try:
-        # Create temp files
-        with tempfile.NamedTemporaryFile(suffix='.srt', delete=False) as tmp1:
-            temp_primary = tmp1.name
-        with tempfile.NamedTemporaryFile(suffix='.srt', delete=False) as tmp2:
-            temp_secondary = tmp2.name
+    # Both sync outputs live in one scratch directory, removed in one go
+    tmpdir = tempfile.mkdtemp(prefix='dualsub-')
+    temp_primary = os.path.join(tmpdir, 'p.srt')
+    temp_secondary = os.path.join(tmpdir, 's.srt')
 
+    try:
         result = sync_subtitles_hybrid(
             video_path, primary_path, secondary_path,
             temp_primary, temp_secondary
@@ -282,17 +284,10 @@ def _sync_to_video(
             if result['primary_result']['success']:
                 actual_primary_path = temp_primary
                 sync_report.primary_synced = True
-            else:
-                _safe_delete(temp_primary)
 
             if result['secondary_result']['success']:
                 actual_secondary_path = temp_secondary
                 sync_report.secondary_synced = True
-            else:
-                _safe_delete(temp_secondary)
-        else:
-            _safe_delete(temp_primary)
-            _safe_delete(temp_secondary)
 
         sync_report.successful = sync_report.primary_synced or sync_report.secondary_synced
         sync_report.method = result.get('method')
@@ -301,6 +296,11 @@ def _sync_to_video(
         sync_report.error = str(e)
         logger.error(f"Video synchronization failed: {e}")
 
+    if sync_report.successful:
+        sync_report.temp_dir = tmpdir
+    else:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
     return actual_primary_path, actual_secondary_path, sync_report
 
 
@@ -368,8 +368,22 @@ def _safe_delete(path: str) -> None:
         logger.debug(f"Failed to delete temp file {path}: {e}")
 
 
-def cleanup_temp_files(paths: List[str], original_paths: List[str]) -> None:
-    """Clean up temporary sync files that differ from originals."""
+def cleanup_temp_files(
+    paths: List[str],
+    original_paths: List[str],
+    temp_dir: Optional[str] = None
+) -> None:
+    """Clean up temporary sync files that differ from originals.
+
+    If ``temp_dir`` is given (see ``SyncReport.temp_dir``), the whole
+    directory is removed in one call; files living inside it are skipped.
+    """
+    if temp_dir:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
     for path, original in zip(paths, original_paths):
-        if path != original:
-            _safe_delete(path)
+        if path == original:
+            continue
+        if temp_dir and os.path.dirname(path) == temp_dir:
+            continue
+        _safe_delete(path)
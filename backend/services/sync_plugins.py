@@ -2,22 +2,42 @@
 Simplified subtitle synchronization using ffsubsync
 """
 
+import functools
 import logging
+import multiprocessing
+import os
 import re
 import shutil
+import signal
 import subprocess
+import threading
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
-import chardet
+import numpy as np
 import pysubs2
+from pysubs2.exceptions import UnknownFileExtensionError
+from pysubs2.formats import get_format_identifier
 
 from config import settings
+from utils.encoding import decode_subtitle_bytes, detect_file_encoding
+from .ffsubsync_pool import ffsubsync_pool
 
 logger = logging.getLogger(__name__)
 
+# Offset line printed by ffsubsync on success
+_OFFSET_RE = re.compile(r'offset:\s*([-\d.]+)\s*seconds', re.IGNORECASE)
+
+# Run ffsubsync in its own process group so a timeout can also kill the
+# ffmpeg it spawns (POSIX only)
+_NEW_SESSION = os.name == 'posix'
+
+# Longest wait for an output reader after ffsubsync exits
+_READER_JOIN_SECONDS = 5
+
 
 class SyncMethod(Enum):
     """Available synchronization methods"""
@@ -37,18 +57,69 @@ class SyncResult:
     error: Optional[str] = None
 
 
+@functools.lru_cache(maxsize=1)
+def _ffsubsync_path() -> Optional[str]:
+    """Resolve the ffsubsync executable once per process (None if not installed)"""
+    return shutil.which('ffsubsync')
+
+
+def _kill_process_tree(proc: subprocess.Popen) -> None:
+    """Kill ffsubsync and any children still holding its output pipes"""
+    if _NEW_SESSION:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+            return
+        except ProcessLookupError:
+            pass
+    proc.kill()
+
+
+def _parse_offset_ms(text: str) -> Optional[int]:
+    """Extract the offset ffsubsync reports, in milliseconds"""
+    match = _OFFSET_RE.search(text)
+    if match:
+        return int(float(match.group(1)) * 1000)
+    return None
+
+
+def _is_copyable(subs: pysubs2.SSAFile, source_path: str, output_path: str) -> bool:
+    """Whether the source file's bytes are already valid content for output_path"""
+    ext = Path(source_path).suffix.lower()
+    if ext != Path(output_path).suffix.lower():
+        return False
+    try:
+        return subs.format == get_format_identifier(ext)
+    except UnknownFileExtensionError:
+        return False
+
+
+def _sample_indices(length: int, sample_points: int) -> np.ndarray:
+    """Indices of ``sample_points`` evenly spaced events in a list of ``length``.
+
+    Same float arithmetic as ``int((i / (sample_points - 1)) * (length - 1))``
+    so the sampled events match the per-index loop exactly.
+    """
+    if sample_points <= 1:
+        return np.zeros(sample_points, dtype=np.intp)
+    return (np.arange(sample_points) / (sample_points - 1) * (length - 1)).astype(np.intp)
+
+
+def _scan_for_offset(stream, found: list) -> None:
+    """Read ffsubsync stdout to EOF, keeping the first offset it reports"""
+    for line in stream:
+        if not found:
+            offset_ms = _parse_offset_ms(line)
+            if offset_ms is not None:
+                found.append(offset_ms)
+
+
 class SimplifiedSubtitleSynchronizer:
     """Simplified synchronizer that primarily uses ffsubsync"""
     
-    def __init__(self):
-        self._ffsubsync_available = None
-    
     @property
     def ffsubsync_available(self) -> bool:
         """Check if ffsubsync is installed"""
-        if self._ffsubsync_available is None:
-            self._ffsubsync_available = shutil.which('ffsubsync') is not None
-        return self._ffsubsync_available
+        return _ffsubsync_path() is not None
     
     def sync_subtitles(
         self,
@@ -89,6 +160,73 @@ class SimplifiedSubtitleSynchronizer:
             reference_path, target_path, output_path, **kwargs
         )
     
+    def _ffsubsync_options(self, **kwargs) -> Tuple[int, List[str]]:
+        """Resolve the timeout and CLI options for an ffsubsync run"""
+
+        max_offset = kwargs.get('max_offset_seconds', settings.subtitle.max_sync_offset_seconds)
+        timeout = kwargs.get('timeout', settings.subtitle.sync_timeout_seconds)
+        
+        # For bulk operations, use faster settings
+        bulk_mode = kwargs.get('bulk_mode', False)
+        if bulk_mode:
+            timeout = min(timeout, 90)
+        
+        options = [
+            '--max-offset-seconds', str(max_offset),
+            '--no-fix-framerate'
+        ]
+
+        # Add performance optimizations for bulk
+        if bulk_mode:
+            options.extend([
+                '--max-subtitle-seconds', '180',  # 3 minutes for speed
+                '--vad', 'webrtc',  # Faster VAD
+            ])
+
+        return timeout, options
+
+    def _ffsubsync_command(
+        self,
+        reference_path: str,
+        target_path: str,
+        output_path: str,
+        options: List[str]
+    ) -> List[str]:
+        """Build the ffsubsync command line"""
+        return [
+            _ffsubsync_path() or 'ffsubsync',
+            str(reference_path),
+            '-i', str(target_path),
+            '-o', str(output_path),
+            *options
+        ]
+
+    def _ffsubsync_result(
+        self,
+        returncode: int,
+        offset_ms: Optional[int],
+        stderr: str,
+        output_path: str
+    ) -> SyncResult:
+        """Turn a finished ffsubsync process into a SyncResult"""
+
+        if returncode == 0 and Path(output_path).exists():
+            return SyncResult(
+                success=True,
+                method=SyncMethod.FFSUBSYNC,
+                output_path=output_path,
+                offset_ms=offset_ms,
+                confidence=0.95
+            )
+
+        error_msg = stderr.strip() if stderr else 'Unknown ffsubsync error'
+        return SyncResult(
+            success=False,
+            method=SyncMethod.FFSUBSYNC,
+            output_path=output_path,
+            error=f"ffsubsync failed: {error_msg}"
+        )
+
     def _sync_with_ffsubsync(
         self,
         reference_path: str,
@@ -98,49 +236,98 @@ class SimplifiedSubtitleSynchronizer:
     ) -> SyncResult:
         """Synchronize using ffsubsync"""
         
-        max_offset = kwargs.get('max_offset_seconds', settings.subtitle.max_sync_offset_seconds)
-        timeout = kwargs.get('timeout', settings.subtitle.sync_timeout_seconds)
-        
-        # For bulk operations, use faster settings
-        bulk_mode = kwargs.get('bulk_mode', False)
-        if bulk_mode:
-            timeout = min(timeout, 90)
-        
+        timeout, options = self._ffsubsync_options(**kwargs)
+
+        # Reuse warm workers instead of starting a new interpreter per file
+        if kwargs.get('bulk_mode', False) and ffsubsync_pool.enabled:
+            return self._sync_with_ffsubsync_pool(
+                reference_path, target_path, output_path, options, timeout
+            )
+
         try:
-            # Build ffsubsync command
-            cmd = [
-                'ffsubsync',
-                str(reference_path),
-                '-i', str(target_path),
-                '-o', str(output_path),
-                '--max-offset-seconds', str(max_offset),
-                '--no-fix-framerate'
-            ]
-            
-            # Add performance optimizations for bulk
-            if bulk_mode:
-                cmd.extend([
-                    '--max-subtitle-seconds', '180',  # 3 minutes for speed
-                    '--vad', 'webrtc',  # Faster VAD
-                ])
+            cmd = self._ffsubsync_command(reference_path, target_path, output_path, options)
             
             logger.debug(f"Running ffsubsync: {' '.join(cmd[:3])}...")
 
-            # Run ffsubsync
-            result = subprocess.run(
+            # Run ffsubsync, scanning its output as it arrives. Both pipes
+            # are drained on reader threads so a chatty child never blocks.
+            offset_found = []
+            stderr_tail = deque(maxlen=50)
+            proc = subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=timeout
+                errors='replace',
+                bufsize=1,
+                start_new_session=_NEW_SESSION
             )
+            streams = (proc.stdout, proc.stderr)
+            readers = [
+                threading.Thread(target=_scan_for_offset, args=(proc.stdout, offset_found), daemon=True),
+                threading.Thread(target=stderr_tail.extend, args=(proc.stderr,), daemon=True),
+            ]
+            for reader in readers:
+                reader.start()
+            try:
+                proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                _kill_process_tree(proc)
+                proc.wait()
+                raise
+            finally:
+                # A surviving grandchild can keep a pipe open; never wait on
+                # it forever, and leave a blocked reader's stream unclosed
+                # (closing it would block on the reader's buffer lock)
+                for stream, reader in zip(streams, readers):
+                    reader.join(timeout=_READER_JOIN_SECONDS)
+                    if reader.is_alive():
+                        logger.warning("ffsubsync output pipe still open, abandoning its reader")
+                    else:
+                        stream.close()
 
-            if result.returncode == 0 and Path(output_path).exists():
-                # Extract offset if possible from output
-                offset_ms = None
-                match = re.search(r'offset:\s*([-\d.]+)\s*seconds', result.stdout, re.IGNORECASE)
-                if match:
-                    offset_ms = int(float(match.group(1)) * 1000)
+            return self._ffsubsync_result(
+                proc.returncode,
+                offset_found[0] if offset_found else None,
+                ''.join(stderr_tail),
+                output_path
+            )
                 
+        except subprocess.TimeoutExpired:
+            return SyncResult(
+                success=False,
+                method=SyncMethod.FFSUBSYNC,
+                output_path=output_path,
+                error=f"ffsubsync timed out after {timeout} seconds"
+            )
+        except Exception as e:
+            return SyncResult(
+                success=False,
+                method=SyncMethod.FFSUBSYNC,
+                output_path=output_path,
+                error=f"Unexpected error: {str(e)}"
+            )
+
+    def _sync_with_ffsubsync_pool(
+        self,
+        reference_path: str,
+        target_path: str,
+        output_path: str,
+        options: list,
+        timeout: int
+    ) -> SyncResult:
+        """Synchronize using an in-process ffsubsync worker from the pool"""
+
+        try:
+            result = ffsubsync_pool.run(
+                str(reference_path), str(target_path), str(output_path), options, timeout
+            )
+
+            if result['retval'] == 0 and Path(output_path).exists():
+                offset_ms = None
+                if result['offset_seconds'] is not None:
+                    offset_ms = int(result['offset_seconds'] * 1000)
+
                 return SyncResult(
                     success=True,
                     method=SyncMethod.FFSUBSYNC,
@@ -148,16 +335,14 @@ class SimplifiedSubtitleSynchronizer:
                     offset_ms=offset_ms,
                     confidence=0.95
                 )
-            else:
-                error_msg = result.stderr.strip() if result.stderr else 'Unknown ffsubsync error'
-                return SyncResult(
-                    success=False,
-                    method=SyncMethod.FFSUBSYNC,
-                    output_path=output_path,
-                    error=f"ffsubsync failed: {error_msg}"
-                )
-                
-        except subprocess.TimeoutExpired:
+            return SyncResult(
+                success=False,
+                method=SyncMethod.FFSUBSYNC,
+                output_path=output_path,
+                error=f"ffsubsync failed: worker returned {result['retval']}"
+            )
+
+        except multiprocessing.TimeoutError:
             return SyncResult(
                 success=False,
                 method=SyncMethod.FFSUBSYNC,
@@ -171,7 +356,7 @@ class SimplifiedSubtitleSynchronizer:
                 output_path=output_path,
                 error=f"Unexpected error: {str(e)}"
             )
-    
+
     def _sync_with_offset(
         self,
         reference_path: str,
@@ -187,20 +372,27 @@ class SimplifiedSubtitleSynchronizer:
         try:
             # Detect encoding and load subtitle file
             def detect_and_load(file_path):
+                encoding = detect_file_encoding(file_path)
                 with open(file_path, 'rb') as f:
                     raw = f.read()
-                    encoding = chardet.detect(raw)['encoding'] or 'utf-8'
+                # Parse the bytes already in memory rather than reopening the file
                 try:
-                    return pysubs2.load(file_path, encoding=encoding)
+                    text = decode_subtitle_bytes(raw, encoding)
+                    # .srt needs no format sniffing; mislabeled files fall through
+                    if Path(file_path).suffix.lower() == '.srt':
+                        subs = pysubs2.SSAFile.from_string(text, format_='srt')
+                        if subs:
+                            return subs
+                    return pysubs2.SSAFile.from_string(text)
                 except Exception:
-                    return pysubs2.load(file_path, encoding='utf-8', errors='replace')
+                    return pysubs2.SSAFile.from_string(decode_subtitle_bytes(raw, 'utf-8', 'replace'))
             
             ref_subs = detect_and_load(reference_path)
             target_subs = detect_and_load(target_path)
             
             if not ref_subs or not target_subs:
                 # Can't sync empty files
-                shutil.copy2(target_path, output_path)
+                shutil.copyfile(target_path, output_path)
                 return SyncResult(
                     success=True,
                     method=SyncMethod.MANUAL_OFFSET,
@@ -210,19 +402,40 @@ class SimplifiedSubtitleSynchronizer:
                     error="Empty subtitle file"
                 )
             
+            # Pull the timings out once; the offset maths only needs starts
+            ref_starts = np.fromiter((line.start for line in ref_subs), dtype=np.int64, count=len(ref_subs))
+            starts = np.fromiter((line.start for line in target_subs), dtype=np.int64, count=len(target_subs))
+            
             # Calculate offset based on matching patterns
-            offset_ms = self._calculate_best_offset(ref_subs, target_subs)
+            offset_ms = self._calculate_best_offset(ref_starts, starts)
             
-            # Apply offset
-            for line in target_subs:
-                line.start += offset_ms
-                line.end += offset_ms
-                
-                # Ensure no negative timestamps
-                if line.start < 0:
-                    line.start = 0
-                if line.end < 0:
-                    line.end = 0
+            if offset_ms == 0:
+                # Already aligned: nothing to shift, so skip the rewrite
+                # unless the output needs a different format
+                if _is_copyable(target_subs, target_path, output_path):
+                    shutil.copyfile(target_path, output_path)
+                else:
+                    target_subs.save(output_path)
+                return SyncResult(
+                    success=True,
+                    method=SyncMethod.MANUAL_OFFSET,
+                    output_path=output_path,
+                    offset_ms=0,
+                    confidence=0.6
+                )
+            
+            # Apply offset to all timings at once
+            ends = np.fromiter((line.end for line in target_subs), dtype=np.int64, count=len(target_subs))
+            starts += offset_ms
+            ends += offset_ms
+            
+            # Ensure no negative timestamps
+            np.maximum(starts, 0, out=starts)
+            np.maximum(ends, 0, out=ends)
+            
+            for line, start, end in zip(target_subs, starts.tolist(), ends.tolist()):
+                line.start = start
+                line.end = end
             
             # Save adjusted subtitle
             target_subs.save(output_path)
@@ -237,7 +450,7 @@ class SimplifiedSubtitleSynchronizer:
             
         except Exception as e:
             # If all else fails, just copy the file
-            shutil.copy2(target_path, output_path)
+            shutil.copyfile(target_path, output_path)
             return SyncResult(
                 success=True,
                 method=SyncMethod.MANUAL_OFFSET,
@@ -247,41 +460,41 @@ class SimplifiedSubtitleSynchronizer:
                 error=f"Fallback failed, using original: {str(e)}"
             )
     
-    def _calculate_best_offset(self, ref_subs, target_subs) -> int:
+    def _calculate_best_offset(self, ref_starts: np.ndarray, target_starts: np.ndarray) -> int:
         """
         Calculate best offset using timing patterns
         Doesn't assume which language is "master"
+        
+        Args:
+            ref_starts: Start times (ms) of the reference events, in file order
+            target_starts: Start times (ms) of the target events, in file order
         """
         
         # If subtitle counts are very different, use simple start alignment
-        if abs(len(ref_subs) - len(target_subs)) > len(ref_subs) * 0.3:
+        if abs(len(ref_starts) - len(target_starts)) > len(ref_starts) * 0.3:
             # Just align the first subtitles
-            if ref_subs and target_subs:
-                return ref_subs[0].start - target_subs[0].start
+            if len(ref_starts) and len(target_starts):
+                return int(ref_starts[0] - target_starts[0])
             return 0
         
         # Sample multiple points for offset calculation
-        sample_points = min(10, len(ref_subs), len(target_subs))
-        offset_samples = []
-        
-        for i in range(sample_points):
-            ref_idx = int((i / (sample_points - 1)) * (len(ref_subs) - 1)) if sample_points > 1 else 0
-            target_idx = int((i / (sample_points - 1)) * (len(target_subs) - 1)) if sample_points > 1 else 0
-            
-            if ref_idx < len(ref_subs) and target_idx < len(target_subs):
-                offset = ref_subs[ref_idx].start - target_subs[target_idx].start
-                offset_samples.append(offset)
-        
-        if not offset_samples:
+        sample_points = min(settings.subtitle.offset_sample_points, len(ref_starts), len(target_starts))
+        if sample_points == 0:
             return 0
         
-        # Use median offset to reduce impact of outliers
-        offset_samples.sort()
-        median_offset = offset_samples[len(offset_samples) // 2]
+        # Evenly spaced indices across both files
+        ref_idx = _sample_indices(len(ref_starts), sample_points)
+        target_idx = _sample_indices(len(target_starts), sample_points)
+        offset_samples = ref_starts[ref_idx] - target_starts[target_idx]
+        
+        # Use median offset to reduce impact of outliers (O(n) selection)
+        mid = len(offset_samples) // 2
+        median_offset = int(np.partition(offset_samples, mid)[mid])
         
         # Check if offsets are consistent
         if len(offset_samples) > 1:
-            variance = sum((o - median_offset) ** 2 for o in offset_samples) / len(offset_samples)
+            deviations = offset_samples - median_offset
+            variance = float(deviations @ deviations) / len(deviations)
             # If variance is too high, the subtitles might not match well
             if variance > 1000000:  # More than 1 second variance
                 logger.warning("High timing variance detected, sync may be inaccurate")
@@ -314,4 +527,4 @@ def sync_subtitles(
     """
     return _synchronizer.sync_subtitles(
         reference_path, target_path, output_path, video_path, **kwargs
-    )
\ No newline at end of file
+    )
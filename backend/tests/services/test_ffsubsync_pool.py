@@ -0,0 +1,106 @@
+"""
+Tests for services/ffsubsync_pool.py
+"""
+
+import multiprocessing
+import threading
+import time
+from multiprocessing.pool import RUN
+
+import pytest
+
+from services.ffsubsync_pool import FFSubsyncWorkerPool
+
+
+def _no_import() -> None:
+    """Worker initializer that skips importing ffsubsync."""
+
+
+def _fake_sync(reference_path, target_path, output_path, options):
+    """Stand-in job: sleeps for ``reference_path`` seconds."""
+    time.sleep(float(reference_path))
+    return {'retval': 0, 'offset_seconds': 0.0, 'sync_was_successful': True}
+
+
+class FakeWorkerPool(FFSubsyncWorkerPool):
+    """Worker pool running _fake_sync instead of ffsubsync."""
+
+    _initializer = staticmethod(_no_import)
+    _task = staticmethod(_fake_sync)
+
+
+@pytest.fixture
+def pool():
+    """Create a two-worker fake pool, closed after the test."""
+    worker_pool = FakeWorkerPool(processes=2)
+    yield worker_pool
+    worker_pool.close()
+
+
+def _wait_until(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+class TestFFSubsyncWorkerPool:
+    """Tests for FFSubsyncWorkerPool."""
+
+    def test_disabled_with_zero_processes(self):
+        """Test a zero-sized pool reports itself disabled."""
+        assert FFSubsyncWorkerPool(processes=0).enabled is False
+
+    def test_run_success(self, pool):
+        """Test a job's result is returned and the worker pool is reused."""
+        result = pool.run('0', 'target.srt', 'out.srt', [], timeout=30)
+        first = pool._pool
+
+        assert result['sync_was_successful'] is True
+        assert pool.run('0', 'target.srt', 'out.srt', [], timeout=30)['retval'] == 0
+        assert pool._pool is first
+        assert pool._in_flight == {}
+
+    def test_timeout_raises(self, pool):
+        """Test a runaway job raises TimeoutError and retires its pool."""
+        pool.run('0', 'target.srt', 'out.srt', [], timeout=30)
+        old = pool._pool
+
+        with pytest.raises(multiprocessing.TimeoutError):
+            pool.run('30', 'target.srt', 'out.srt', [], timeout=0.2)
+
+        assert pool._pool is None
+        # Nothing else was running on it, so it is terminated right away
+        assert _wait_until(lambda: old._state != RUN)
+
+    def test_recovers_after_timeout(self, pool):
+        """Test the next job after a timeout runs on a fresh pool."""
+        with pytest.raises(multiprocessing.TimeoutError):
+            pool.run('30', 'target.srt', 'out.srt', [], timeout=0.2)
+
+        result = pool.run('0', 'target.srt', 'out.srt', [], timeout=30)
+
+        assert result['sync_was_successful'] is True
+
+    def test_timeout_spares_concurrent_jobs(self, pool):
+        """Test a timed-out job does not fail a job running alongside it."""
+        pool.run('0', 'target.srt', 'out.srt', [], timeout=30)  # start workers
+        old = pool._pool
+        results = {}
+
+        def slow_but_healthy():
+            results['healthy'] = pool.run('1', 'target.srt', 'out.srt', [], timeout=30)
+
+        worker = threading.Thread(target=slow_but_healthy)
+        worker.start()
+        assert _wait_until(lambda: pool._in_flight.get(old) == 1)
+
+        with pytest.raises(multiprocessing.TimeoutError):
+            pool.run('30', 'target.srt', 'out.srt', [], timeout=0.2)
+        worker.join(timeout=30)
+
+        assert results['healthy']['sync_was_successful'] is True
+        # The retired pool is reaped once its last job has finished
+        assert _wait_until(lambda: old._state != RUN)
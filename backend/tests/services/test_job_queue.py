@@ -21,6 +21,12 @@ def job_queue():
     return JobQueue(max_concurrent_jobs=2)
 
 
+def _set_status(job_queue, job_id, status):
+    """Force a job's status through the queue so its status index stays in step."""
+    with job_queue._lock:
+        job_queue._set_status(job_queue.jobs[job_id], status)
+
+
 class TestJobProgress:
     """Tests for JobProgress dataclass."""
 
@@ -142,7 +148,7 @@ class TestJobQueue:
         )
 
         # Mark one as completed directly for testing
-        job_queue.jobs[job_id].status = JobStatus.COMPLETED
+        _set_status(job_queue, job_id, JobStatus.COMPLETED)
 
         job_queue.create_job(
             JobType.SINGLE_SUBTITLE_SYNC,
@@ -177,8 +183,8 @@ class TestJobQueue:
         )
 
         # Set statuses
-        job_queue.jobs[job_id2].status = JobStatus.RUNNING
-        job_queue.jobs[job_id3].status = JobStatus.COMPLETED
+        _set_status(job_queue, job_id2, JobStatus.RUNNING)
+        _set_status(job_queue, job_id3, JobStatus.COMPLETED)
 
         active = job_queue.get_active_jobs()
         assert len(active) == 2
@@ -214,7 +220,7 @@ class TestJobQueue:
             "Test Job", "Desc",
             {}
         )
-        job_queue.jobs[job_id].status = JobStatus.COMPLETED
+        _set_status(job_queue, job_id, JobStatus.COMPLETED)
 
         result = job_queue.cancel_job(job_id)
         assert result is False
@@ -231,7 +237,7 @@ class TestJobQueue:
         assert job_queue.is_job_cancelled(job_id) is False
 
         # Mark running and set cancelled flag
-        job_queue.jobs[job_id].status = JobStatus.RUNNING
+        _set_status(job_queue, job_id, JobStatus.RUNNING)
         job_queue.jobs[job_id].metadata['cancelled'] = True
 
         assert job_queue.is_job_cancelled(job_id) is True
@@ -243,7 +249,7 @@ class TestJobQueue:
             "Test Job", "Desc",
             {}
         )
-        job_queue.jobs[job_id].status = JobStatus.RUNNING
+        _set_status(job_queue, job_id, JobStatus.RUNNING)
 
         job_queue.complete_job(job_id, {'success': True, 'count': 5})
 
@@ -260,7 +266,7 @@ class TestJobQueue:
             "Test Job", "Desc",
             {}
         )
-        job_queue.jobs[job_id].status = JobStatus.RUNNING
+        _set_status(job_queue, job_id, JobStatus.RUNNING)
 
         job_queue.fail_job(job_id, "Something went wrong")
 
@@ -276,7 +282,7 @@ class TestJobQueue:
             "Test Job", "Desc",
             {}
         )
-        job_queue.jobs[job_id].status = JobStatus.RUNNING
+        _set_status(job_queue, job_id, JobStatus.RUNNING)
 
         job_queue.update_job_progress(job_id, {
             'current_step': 'Processing',
@@ -302,7 +308,7 @@ class TestJobQueue:
             "Old Job", "Desc",
             {}
         )
-        job_queue.jobs[job_id].status = JobStatus.COMPLETED
+        _set_status(job_queue, job_id, JobStatus.COMPLETED)
         job_queue.jobs[job_id].completed_at = datetime.now() - timedelta(hours=25)
 
         # Create a recent job
@@ -311,7 +317,7 @@ class TestJobQueue:
             "Recent Job", "Desc",
             {}
         )
-        job_queue.jobs[recent_id].status = JobStatus.COMPLETED
+        _set_status(job_queue, recent_id, JobStatus.COMPLETED)
         job_queue.jobs[recent_id].completed_at = datetime.now()
 
         # Cleanup
@@ -320,6 +326,23 @@ class TestJobQueue:
         assert removed == 1
         assert job_queue.get_job(job_id) is None
         assert job_queue.get_job(recent_id) is not None
+        assert job_queue.get_all_jobs(JobStatus.COMPLETED) == [job_queue.get_job(recent_id)]
+
+    def test_status_filter_follows_transitions(self, job_queue):
+        """Test status filters stay correct as a job moves between states."""
+        job_id = job_queue.create_job(
+            JobType.BULK_DUAL_SUBTITLE,
+            "Test Job", "Desc",
+            {}
+        )
+
+        _set_status(job_queue, job_id, JobStatus.RUNNING)
+        job_queue.fail_job(job_id, "boom")
+
+        assert job_queue.get_all_jobs(JobStatus.PENDING) == []
+        assert job_queue.get_all_jobs(JobStatus.RUNNING) == []
+        assert [j.id for j in job_queue.get_all_jobs(JobStatus.FAILED)] == [job_id]
+        assert job_queue.get_active_jobs() == []
 
 
 class TestJobTypes:
@@ -3,6 +3,7 @@ Tests for services/language_detector.py
 """
 
 import pytest
+import sys
 import tempfile
 from pathlib import Path
 
@@ -49,6 +50,13 @@ class TestLanguageDetectionResult:
         assert result.alternative_language is None
         assert result.sample_size == 0
 
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need 3.10+")
+    def test_uses_slots(self):
+        """Test results carry no per-instance __dict__."""
+        result = LanguageDetectionResult(detected_language=Language.ENGLISH, confidence=0.5)
+
+        assert not hasattr(result, '__dict__')
+
 
 class TestNormalizeLanguageCode:
     """Tests for _normalize_language_code method."""
@@ -165,6 +173,19 @@ class TestExtractSampleText:
         assert "</i>" not in sample
         assert "Hello" in sample
 
+    def test_tags_do_not_span_events(self, detector):
+        """Test a stray '<' in one event does not swallow text up to the next event's '>'."""
+        import pysubs2
+
+        subs = pysubs2.SSAFile()
+        subs.append(pysubs2.SSAEvent(text="I <3 you"))
+        subs.append(pysubs2.SSAEvent(text="Middle line"))
+        subs.append(pysubs2.SSAEvent(text="a -> b"))
+
+        sample = detector._extract_sample_text(subs)
+
+        assert sample == "I <3 you Middle line a -> b"
+
 
 class TestDetectEncoding:
     """Tests for detect_encoding method."""
@@ -195,6 +216,33 @@ class TestDetectEncoding:
             temp_path.unlink()
 
 
+class TestDetectFromFileCache:
+    """Tests for memoized detect_from_file."""
+
+    def test_repeat_call_is_cached_copy(self, detector, tmp_path):
+        """Test a repeat call is served from cache and can't alter it."""
+        path = tmp_path / "ep.srt"
+        path.write_text("1\n00:00:01,000 --> 00:00:02,000\nHello world\n", encoding="utf-8")
+
+        first = detector.detect_from_file(path, "en")
+        first.confidence = 0.0
+        second = detector.detect_from_file(path, "en")
+
+        assert detector._detect_cached.cache_info().hits == 1
+        assert second.confidence != 0.0
+
+    def test_modified_file_is_redetected(self, detector, tmp_path):
+        """Test rewriting the file invalidates its cache entry."""
+        path = tmp_path / "ep.srt"
+        path.write_text("1\n00:00:01,000 --> 00:00:02,000\nHello\n", encoding="utf-8")
+        detector.detect_from_file(path, "en")
+
+        path.write_text("1\n00:00:01,000 --> 00:00:02,000\nHello again\n", encoding="utf-8")
+        detector.detect_from_file(path, "en")
+
+        assert detector._detect_cached.cache_info().misses == 2
+
+
 class TestChineseVariantDetection:
     """Tests for Chinese Simplified vs Traditional detection."""
 
@@ -247,3 +295,11 @@ class TestRefineChineseDetection:
 
         assert result.detected_language == Language.CHINESE_SIMPLIFIED
         assert 'simplified_indicators' in result.details
+
+    def test_indicator_counts_single_pass(self, detector):
+        """Test both variant counts come out of one scan, shared characters counting for each."""
+        # 器 and 理 are in both pools; the private-use markers must not be counted
+        text = "繁體器理简体abc\ue010\ue011\ue012"
+
+        assert detector._count_variant_indicators(text) == (4, 4)
+        assert detector._count_variant_indicators("") == (0, 0)
@@ -5,10 +5,13 @@ Tests the subtitle utility methods that don't require Plex integration.
 """
 
 import pytest
+import pysubs2
 import tempfile
 from pathlib import Path
 
-from services.subtitle_service import SubtitleService
+import services.subtitle_service as subtitle_service_module
+from services.subtitle_service import SubtitleService, _first_primary_overlaps
+from services.subtitle_sync import SyncReport
 
 
 @pytest.fixture
@@ -17,7 +20,7 @@ def subtitle_service():
     return SubtitleService()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_srt_content():
     """Sample SRT subtitle content."""
     return """1
@@ -34,12 +37,12 @@ Testing encoding detection.
 """
 
 
-@pytest.fixture
-def sample_srt_file(sample_srt_content):
-    """Create a temporary SRT file."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.srt', delete=False, encoding='utf-8') as f:
-        f.write(sample_srt_content)
-        return f.name
+@pytest.fixture(scope="module")
+def sample_srt_file(sample_srt_content, tmp_path_factory):
+    """Write the sample SRT once per module (tests must not modify it)."""
+    path = tmp_path_factory.mktemp("subs") / "sample.srt"
+    path.write_text(sample_srt_content, encoding='utf-8')
+    return str(path)
 
 
 class TestDetectEncoding:
@@ -50,7 +53,6 @@ class TestDetectEncoding:
         encoding = subtitle_service.detect_encoding(sample_srt_file)
         # chardet may return 'ascii' for pure ASCII content
         assert encoding.lower() in ['utf-8', 'ascii']
-        Path(sample_srt_file).unlink()
 
     def test_detects_non_ascii_utf8(self, subtitle_service):
         """Test detection of UTF-8 with non-ASCII characters."""
@@ -73,14 +75,12 @@ class TestLoadSubtitle:
 
         assert len(subs) == 3
         assert "Hello, world!" in subs[0].text
-        Path(sample_srt_file).unlink()
 
     def test_loads_with_explicit_encoding(self, subtitle_service, sample_srt_file):
         """Test loading with explicit encoding."""
         subs = subtitle_service.load_subtitle(sample_srt_file, encoding='utf-8')
 
         assert len(subs) == 3
-        Path(sample_srt_file).unlink()
 
     def test_loads_japanese_subtitles(self, subtitle_service):
         """Test loading subtitles with Japanese text."""
@@ -93,6 +93,42 @@ class TestLoadSubtitle:
         assert "こんにちは" in subs[0].text
         Path(temp_path).unlink()
 
+    def test_srt_matches_pysubs2(self, subtitle_service, tmp_path):
+        """Test the SRT fast path gives the same events as pysubs2.load."""
+        path = tmp_path / "tags.srt"
+        path.write_text(
+            "1\r\n00:00:01,000 --> 00:00:02,000\r\n<i>Hi</i> < b >there</ b>\r\n<font color=red>x</font>\r\n\r\n"
+            "2\r\n00:00:03,5 --> 00:00:04,000\r\n\r\n"
+            "3\r\n00:00:05,000 --> 00:00:06,000\r\nScore:\r\n42\r\n",
+            encoding='utf-8', newline=''
+        )
+
+        subs = subtitle_service.load_subtitle(str(path), encoding='utf-8')
+        expected = pysubs2.load(str(path), encoding='utf-8')
+
+        assert subs.format == 'srt'
+        assert [(e.start, e.end, e.text) for e in subs] == [(e.start, e.end, e.text) for e in expected]
+
+    def test_loads_from_bytes(self, subtitle_service, sample_srt_content):
+        """Test in-memory content loads without touching the filesystem."""
+        data = sample_srt_content.replace("\n", "\r\n").encode('utf-16')
+
+        assert subtitle_service.detect_encoding(data) == 'utf-16'
+        subs = subtitle_service.load_subtitle(data)
+
+        assert len(subs) == 3
+        assert subs[0].text == "Hello, world!"
+
+    def test_mislabelled_srt_uses_detected_format(self, subtitle_service, tmp_path):
+        """Test a WebVTT file with an .srt suffix is still read as WebVTT."""
+        path = tmp_path / "actually.srt"
+        path.write_text("WEBVTT\n\n00:00:01.000 --> 00:00:02.000\nHello\n", encoding='utf-8')
+
+        subs = subtitle_service.load_subtitle(str(path), encoding='utf-8')
+
+        assert subs.format == 'vtt'
+        assert subs[0].text == "Hello"
+
 
 class TestTimesOverlap:
     """Tests for _times_overlap method."""
@@ -135,6 +171,197 @@ class TestTimesOverlap:
         assert subtitle_service._times_overlap(line1, line2) is True
 
 
+class TestFirstPrimaryOverlaps:
+    """Tests for the sorted-sweep overlap search used on large files."""
+
+    class MockLine:
+        def __init__(self, start, end):
+            self.start = start
+            self.end = end
+
+    def test_matches_linear_scan(self, subtitle_service):
+        """Test sweep picks the same primary line as a first-match scan."""
+        import random
+        rng = random.Random(42)
+        primary = []
+        t = 0
+        for _ in range(200):
+            t += rng.randint(0, 3000)
+            primary.append(self.MockLine(t, t + rng.randint(0, 8000)))
+        secondary = []
+        for _ in range(200):
+            s = rng.randint(0, t + 5000)
+            secondary.append(self.MockLine(s, s + rng.randint(0, 4000)))
+
+        expected = [
+            next((i for i, p in enumerate(primary)
+                  if subtitle_service._times_overlap(line, p)), -1)
+            for line in secondary
+        ]
+
+        assert _first_primary_overlaps(primary, secondary) == expected
+
+    def test_unsorted_primary_returns_none(self):
+        """Test unsorted primary lines fall back to the linear scan."""
+        primary = [self.MockLine(5000, 6000), self.MockLine(1000, 2000)]
+        secondary = [self.MockLine(1500, 1800)]
+
+        assert _first_primary_overlaps(primary, secondary) is None
+
+    def test_empty_primary(self):
+        """Test no matches when there are no primary lines."""
+        assert _first_primary_overlaps([], [self.MockLine(0, 1000)]) == [-1]
+
+
+class TestIsAlreadyAligned:
+    """Tests for the sync short-circuit check."""
+
+    def test_aligned_margins(self, subtitle_service):
+        """Test small margins skip sync."""
+        margins = {'duration_delta_ms': 1500, 'first_cue_delta_ms': 200}
+        assert subtitle_service._is_already_aligned(margins) is True
+
+    def test_misaligned_margins(self, subtitle_service):
+        """Test large margins still sync."""
+        assert subtitle_service._is_already_aligned(
+            {'duration_delta_ms': 2500, 'first_cue_delta_ms': 0}
+        ) is False
+        assert subtitle_service._is_already_aligned(
+            {'duration_delta_ms': 0, 'first_cue_delta_ms': 1000}
+        ) is False
+
+    def test_unknown_margins(self, subtitle_service):
+        """Test missing validation never skips sync."""
+        assert subtitle_service._is_already_aligned(None) is False
+
+
+def _fake_validation(results):
+    """validate_subtitle_sync stand-in returning canned results per subtitle path."""
+    return lambda subtitle_path, video_path: results[subtitle_path]
+
+
+def _valid_sync(subtitle_duration_ms, first_start_ms, video_duration_ms=1_200_000):
+    return {
+        'valid': True,
+        'subtitle_duration_ms': subtitle_duration_ms,
+        'video_duration_ms': video_duration_ms,
+        'first_start_ms': first_start_ms,
+    }
+
+
+class TestValidateSync:
+    """Tests for _validate_sync (warnings, margins) results."""
+
+    def test_no_video(self, subtitle_service):
+        """Test nothing is validated without a video."""
+        assert subtitle_service._validate_sync("p.srt", "s.srt", None) == ([], None)
+
+    def test_margins_from_worst_subtitle(self, subtitle_service, monkeypatch):
+        """Test margins report the worst duration delta and the first-cue gap."""
+        monkeypatch.setattr(subtitle_service, "validate_subtitle_sync", _fake_validation({
+            "p.srt": _valid_sync(1_199_000, 5_000),
+            "s.srt": _valid_sync(1_203_000, 5_400),
+        }))
+
+        warnings, margins = subtitle_service._validate_sync("p.srt", "s.srt", "ep.mkv")
+
+        assert warnings == []
+        assert margins == {'duration_delta_ms': 3_000, 'first_cue_delta_ms': 400}
+
+    def test_invalid_subtitle_gives_warning_and_no_margins(self, subtitle_service, monkeypatch):
+        """Test a failed validation returns a warning and no margins."""
+        monkeypatch.setattr(subtitle_service, "validate_subtitle_sync", _fake_validation({
+            "p.srt": _valid_sync(1_199_000, 5_000),
+            "s.srt": {'valid': False, 'warning': 'Subtitle is 10 minutes too long'},
+        }))
+
+        warnings, margins = subtitle_service._validate_sync("p.srt", "s.srt", "ep.mkv")
+
+        assert warnings == ["Secondary subtitle sync issue: Subtitle is 10 minutes too long"]
+        assert margins is None
+
+
+class TestCreateDualSubtitleSyncSkip:
+    """Tests for skipping sync when subtitles already match the video."""
+
+    @pytest.fixture
+    def subtitle_pair(self, tmp_path):
+        """Primary/secondary SRT files and an output path."""
+        primary = tmp_path / "ep.ja.srt"
+        primary.write_text("1\n00:00:01,000 --> 00:00:03,000\nこんにちは\n", encoding="utf-8")
+        secondary = tmp_path / "ep.en.srt"
+        secondary.write_text("1\n00:00:01,000 --> 00:00:03,000\nHello\n", encoding="utf-8")
+        return str(primary), str(secondary), str(tmp_path / "ep.dual.srt")
+
+    @pytest.fixture
+    def sync_calls(self, monkeypatch):
+        """Record prepare_synced_subtitles calls instead of running a sync."""
+        calls = []
+
+        def fake_prepare(primary_path, secondary_path, video_path, enable_sync):
+            calls.append(enable_sync)
+            report = SyncReport(attempted=enable_sync, successful=enable_sync)
+            if enable_sync:
+                report.method = 'ffsubsync'
+            return primary_path, secondary_path, report
+
+        monkeypatch.setattr(subtitle_service_module, "prepare_synced_subtitles", fake_prepare)
+        return calls
+
+    def _create(self, subtitle_service, subtitle_pair):
+        primary, secondary, output = subtitle_pair
+        return subtitle_service.create_dual_subtitle(
+            primary, secondary, output,
+            video_path="ep.mkv",
+            enable_sync=True,
+            enable_language_detection=False
+        )
+
+    def test_aligned_subtitles_skip_sync(self, subtitle_service, subtitle_pair, sync_calls, monkeypatch):
+        """Test aligned subtitles are not synced and the report says why."""
+        primary, secondary, _ = subtitle_pair
+        monkeypatch.setattr(subtitle_service, "validate_subtitle_sync", _fake_validation({
+            primary: _valid_sync(1_199_500, 1_000),
+            secondary: _valid_sync(1_200_500, 1_200),
+        }))
+
+        result = self._create(subtitle_service, subtitle_pair)
+
+        assert result['success'] is True
+        assert sync_calls == [False]
+        assert result['sync_report']['method'] == 'skipped-already-aligned'
+        assert result['sync_report']['attempted'] is False
+        assert 'sync_warnings' not in result
+
+    def test_misaligned_subtitles_sync(self, subtitle_service, subtitle_pair, sync_calls, monkeypatch):
+        """Test margins beyond the tolerances still run the sync."""
+        primary, secondary, _ = subtitle_pair
+        monkeypatch.setattr(subtitle_service, "validate_subtitle_sync", _fake_validation({
+            primary: _valid_sync(1_199_500, 1_000),
+            secondary: _valid_sync(1_200_500, 4_000),
+        }))
+
+        result = self._create(subtitle_service, subtitle_pair)
+
+        assert sync_calls == [True]
+        assert result['sync_report']['method'] == 'ffsubsync'
+
+    def test_sync_warnings_never_skip(self, subtitle_service, subtitle_pair, sync_calls, monkeypatch):
+        """Test a validation warning keeps sync on and is reported."""
+        primary, secondary, _ = subtitle_pair
+        monkeypatch.setattr(subtitle_service, "validate_subtitle_sync", _fake_validation({
+            primary: _valid_sync(1_199_500, 1_000),
+            secondary: {'valid': None, 'warning': 'Could not determine video duration'},
+        }))
+
+        result = self._create(subtitle_service, subtitle_pair)
+
+        assert sync_calls == [True]
+        assert result['sync_warnings'] == [
+            "Secondary subtitle sync issue: Could not determine video duration"
+        ]
+
+
 class TestCreateDualSubtitle:
     """Tests for dual subtitle creation."""
 
@@ -212,71 +439,56 @@ class TestCreateDualSubtitle:
 class TestAdjustSubtitleTiming:
     """Tests for adjust_subtitle_timing method."""
 
-    def test_delays_subtitles(self, subtitle_service, sample_srt_file):
+    def test_delays_subtitles(self, subtitle_service, sample_srt_file, tmp_path):
         """Test delaying subtitles by positive offset."""
-        with tempfile.NamedTemporaryFile(suffix='.srt', delete=False) as f:
-            output_path = f.name
+        output_path = str(tmp_path / "adjusted.srt")
 
-        try:
-            result = subtitle_service.adjust_subtitle_timing(
-                sample_srt_file,
-                offset_ms=2000,  # 2 second delay
-                output_path=output_path
-            )
+        result = subtitle_service.adjust_subtitle_timing(
+            sample_srt_file,
+            offset_ms=2000,  # 2 second delay
+            output_path=output_path
+        )
 
-            assert result['success'] is True
-            assert result['offset_applied_ms'] == 2000
+        assert result['success'] is True
+        assert result['offset_applied_ms'] == 2000
 
-            # Verify the adjustment
-            adjusted = subtitle_service.load_subtitle(output_path)
-            assert adjusted[0].start == 3000  # Was 1000, now 3000
-        finally:
-            Path(sample_srt_file).unlink(missing_ok=True)
-            Path(output_path).unlink(missing_ok=True)
+        # Verify the adjustment
+        adjusted = subtitle_service.load_subtitle(output_path)
+        assert adjusted[0].start == 3000  # Was 1000, now 3000
 
-    def test_advances_subtitles(self, subtitle_service, sample_srt_file):
+    def test_advances_subtitles(self, subtitle_service, sample_srt_file, tmp_path):
         """Test advancing subtitles by negative offset."""
-        with tempfile.NamedTemporaryFile(suffix='.srt', delete=False) as f:
-            output_path = f.name
+        output_path = str(tmp_path / "adjusted.srt")
 
-        try:
-            result = subtitle_service.adjust_subtitle_timing(
-                sample_srt_file,
-                offset_ms=-500,  # 0.5 second advance
-                output_path=output_path
-            )
+        result = subtitle_service.adjust_subtitle_timing(
+            sample_srt_file,
+            offset_ms=-500,  # 0.5 second advance
+            output_path=output_path
+        )
 
-            assert result['success'] is True
-            assert result['offset_applied_ms'] == -500
+        assert result['success'] is True
+        assert result['offset_applied_ms'] == -500
 
-            # Verify the adjustment
-            adjusted = subtitle_service.load_subtitle(output_path)
-            assert adjusted[0].start == 500  # Was 1000, now 500
-        finally:
-            Path(sample_srt_file).unlink(missing_ok=True)
-            Path(output_path).unlink(missing_ok=True)
+        # Verify the adjustment
+        adjusted = subtitle_service.load_subtitle(output_path)
+        assert adjusted[0].start == 500  # Was 1000, now 500
 
-    def test_clamps_negative_times(self, subtitle_service, sample_srt_file):
+    def test_clamps_negative_times(self, subtitle_service, sample_srt_file, tmp_path):
         """Test that times don't go negative."""
-        with tempfile.NamedTemporaryFile(suffix='.srt', delete=False) as f:
-            output_path = f.name
+        output_path = str(tmp_path / "adjusted.srt")
 
-        try:
-            result = subtitle_service.adjust_subtitle_timing(
-                sample_srt_file,
-                offset_ms=-5000,  # 5 second advance (more than first subtitle)
-                output_path=output_path
-            )
+        result = subtitle_service.adjust_subtitle_timing(
+            sample_srt_file,
+            offset_ms=-5000,  # 5 second advance (more than first subtitle)
+            output_path=output_path
+        )
 
-            assert result['success'] is True
+        assert result['success'] is True
 
-            # Verify times don't go negative
-            adjusted = subtitle_service.load_subtitle(output_path)
-            assert adjusted[0].start >= 0
-            assert adjusted[0].end >= 0
-        finally:
-            Path(sample_srt_file).unlink(missing_ok=True)
-            Path(output_path).unlink(missing_ok=True)
+        # Verify times don't go negative
+        adjusted = subtitle_service.load_subtitle(output_path)
+        assert adjusted[0].start >= 0
+        assert adjusted[0].end >= 0
 
 
 class TestPreviewDualSubtitle:
@@ -329,5 +541,4 @@ class TestPreviewDualSubtitle:
             assert len(preview['primary']) == 1
             assert len(preview['secondary']) == 1
         finally:
-            Path(sample_srt_file).unlink(missing_ok=True)
             Path(secondary_path).unlink(missing_ok=True)
@@ -0,0 +1,124 @@
+"""
+Tests for services/subtitle_sync.py
+
+Covers the scratch directory used for sync outputs; ffsubsync itself is
+replaced by stubs.
+"""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import services.subtitle_sync as subtitle_sync
+from services.subtitle_sync import _sync_to_video, cleanup_temp_files
+
+
+@pytest.fixture
+def scratch(tmp_path, monkeypatch):
+    """Make mkdtemp create its directories under a per-test folder."""
+    root = tmp_path / "scratch"
+    root.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(root))
+    return root
+
+
+@pytest.fixture
+def originals(tmp_path):
+    """Primary/secondary subtitle files that must never be deleted."""
+    primary = tmp_path / "ep.ja.srt"
+    secondary = tmp_path / "ep.en.srt"
+    primary.write_text("1\n00:00:01,000 --> 00:00:02,000\nこんにちは\n", encoding="utf-8")
+    secondary.write_text("1\n00:00:01,000 --> 00:00:02,000\nHello\n", encoding="utf-8")
+    return str(primary), str(secondary)
+
+
+def _hybrid_writing_outputs(video_path, primary_path, secondary_path, primary_output, secondary_output):
+    """sync_subtitles_hybrid stand-in that syncs both subtitles."""
+    Path(primary_output).write_text("synced primary", encoding="utf-8")
+    Path(secondary_output).write_text("synced secondary", encoding="utf-8")
+    return {
+        'success': True,
+        'method': 'ffsubsync',
+        'primary_result': {'success': True},
+        'secondary_result': {'success': True},
+    }
+
+
+class TestSyncToVideoTempDir:
+    """Tests for the scratch directory created by _sync_to_video."""
+
+    def test_success_keeps_dir_until_cleanup(self, scratch, originals, monkeypatch):
+        """Test synced outputs stay available, then cleanup removes the whole directory."""
+        monkeypatch.setattr(subtitle_sync, "sync_subtitles_hybrid", _hybrid_writing_outputs)
+
+        primary, secondary, report = _sync_to_video(*originals, "ep.mkv")
+
+        assert report.successful is True
+        assert Path(report.temp_dir).parent == scratch
+        assert Path(primary).read_text(encoding="utf-8") == "synced primary"
+        assert Path(secondary).parent == Path(report.temp_dir)
+
+        cleanup_temp_files([primary, secondary], list(originals), report.temp_dir)
+
+        assert list(scratch.iterdir()) == []
+        assert all(Path(path).exists() for path in originals)
+
+    def test_failed_sync_removes_dir(self, scratch, originals, monkeypatch):
+        """Test an unsuccessful sync removes its directory and keeps the originals."""
+        monkeypatch.setattr(subtitle_sync, "sync_subtitles_hybrid", lambda *args: {
+            'success': False,
+            'primary_result': {'success': False},
+            'secondary_result': {'success': False},
+        })
+
+        primary, secondary, report = _sync_to_video(*originals, "ep.mkv")
+
+        assert report.successful is False
+        assert report.temp_dir is None
+        assert (primary, secondary) == originals
+        assert list(scratch.iterdir()) == []
+
+    def test_sync_error_removes_dir(self, scratch, originals, monkeypatch):
+        """Test an exception during sync removes the directory, outputs included."""
+        def crash(video_path, primary_path, secondary_path, primary_output, secondary_output):
+            Path(primary_output).write_text("partial", encoding="utf-8")
+            raise RuntimeError("ffmpeg not found")
+
+        monkeypatch.setattr(subtitle_sync, "sync_subtitles_hybrid", crash)
+
+        primary, secondary, report = _sync_to_video(*originals, "ep.mkv")
+
+        assert report.error == "ffmpeg not found"
+        assert report.temp_dir is None
+        assert (primary, secondary) == originals
+        assert list(scratch.iterdir()) == []
+
+
+class TestCleanupTempFiles:
+    """Tests for cleanup_temp_files function."""
+
+    def test_deletes_files_outside_temp_dir(self, tmp_path, originals):
+        """Test temp files outside temp_dir are still deleted one by one."""
+        temp_dir = tmp_path / "dualsub-x"
+        temp_dir.mkdir()
+        inside = temp_dir / "p.srt"
+        inside.write_text("synced", encoding="utf-8")
+        outside = tmp_path / "tmp-secondary.srt"
+        outside.write_text("synced", encoding="utf-8")
+
+        cleanup_temp_files([str(inside), str(outside)], list(originals), str(temp_dir))
+
+        assert not temp_dir.exists()
+        assert not outside.exists()
+        assert all(Path(path).exists() for path in originals)
+
+    def test_without_temp_dir(self, tmp_path, originals):
+        """Test only paths that differ from the originals are deleted."""
+        synced = tmp_path / "tmp-secondary.srt"
+        synced.write_text("synced", encoding="utf-8")
+
+        cleanup_temp_files([originals[0], str(synced)], list(originals))
+
+        assert not synced.exists()
+        assert all(Path(path).exists() for path in originals)
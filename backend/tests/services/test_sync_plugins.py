@@ -0,0 +1,244 @@
+"""
+Tests for services/sync_plugins.py
+"""
+
+import sys
+import time
+
+import numpy as np
+import pysubs2
+import pytest
+
+from services.sync_plugins import (
+    SimplifiedSubtitleSynchronizer,
+    SyncMethod,
+    _parse_offset_ms,
+    _sample_indices,
+)
+
+
+def _write_srt(path, events, newline="\n"):
+    """Write (start_ms, end_ms, text) events as an SRT file."""
+    subs = pysubs2.SSAFile()
+    for start, end, text in events:
+        subs.append(pysubs2.SSAEvent(start=start, end=end, text=text))
+    path.write_bytes(subs.to_string("srt").replace("\n", newline).encode("utf-8"))
+    return path
+
+
+@pytest.fixture
+def synchronizer():
+    """Create a fresh SimplifiedSubtitleSynchronizer instance."""
+    return SimplifiedSubtitleSynchronizer()
+
+
+def _loop_indices(length, sample_points):
+    """Per-index sampling the vectorised helper replaced."""
+    return [
+        int((i / (sample_points - 1)) * (length - 1)) if sample_points > 1 else 0
+        for i in range(sample_points)
+    ]
+
+
+class TestSampleIndices:
+    """Tests for _sample_indices."""
+
+    @pytest.mark.parametrize("length, sample_points", [
+        (1, 1), (2, 2), (10, 10), (31, 23), (97, 10), (1000, 57), (2997, 57),
+    ])
+    def test_matches_loop(self, length, sample_points):
+        """Test indices match the original per-index loop."""
+        assert _sample_indices(length, sample_points).tolist() == _loop_indices(length, sample_points)
+
+    def test_matches_loop_exhaustive(self):
+        """Test every small (length, sample_points) pair against the loop."""
+        for length in range(1, 400):
+            for sample_points in range(1, min(length, 30) + 1):
+                expected = _loop_indices(length, sample_points)
+                assert _sample_indices(length, sample_points).tolist() == expected
+
+    def test_endpoints(self):
+        """Test first and last events are always sampled."""
+        indices = _sample_indices(500, 10)
+
+        assert indices[0] == 0
+        assert indices[-1] == 499
+
+
+class TestParseOffsetMs:
+    """Tests for _parse_offset_ms function."""
+
+    def test_positive_offset(self):
+        """Test the offset line is converted to milliseconds."""
+        assert _parse_offset_ms("INFO: offset: 1.250 seconds\n") == 1250
+
+    def test_negative_offset(self):
+        """Test negative offsets keep their sign."""
+        assert _parse_offset_ms("offset: -0.5 seconds") == -500
+
+    def test_case_insensitive(self):
+        """Test the label is matched regardless of case."""
+        assert _parse_offset_ms("Offset: 2 Seconds") == 2000
+
+    def test_no_offset(self):
+        """Test output without an offset line returns None."""
+        assert _parse_offset_ms("framerate ratio: 1.0") is None
+
+
+class TestCalculateBestOffset:
+    """Tests for _calculate_best_offset method."""
+
+    def test_constant_shift(self, synchronizer):
+        """Test a uniform shift is recovered exactly."""
+        target = np.arange(0, 100_000, 2500, dtype=np.int64)
+
+        assert synchronizer._calculate_best_offset(target + 1500, target) == 1500
+
+    def test_median_ignores_outliers(self, synchronizer):
+        """Test a few mismatched samples do not move the offset."""
+        target = np.arange(0, 10_000, 1000, dtype=np.int64)
+        ref = target - 700
+        ref[3] += 50_000
+
+        assert synchronizer._calculate_best_offset(ref, target) == -700
+
+    def test_count_mismatch_aligns_first_events(self, synchronizer):
+        """Test very different event counts fall back to aligning the first events."""
+        ref = np.array([5000, 6000, 7000, 8000, 9000, 10000], dtype=np.int64)
+        target = np.array([3000, 4000], dtype=np.int64)
+
+        assert synchronizer._calculate_best_offset(ref, target) == 2000
+
+    def test_empty(self, synchronizer):
+        """Test empty inputs give no offset."""
+        empty = np.array([], dtype=np.int64)
+
+        assert synchronizer._calculate_best_offset(empty, empty) == 0
+
+    def test_returns_python_int(self, synchronizer):
+        """Test the offset is a plain int, not a numpy scalar."""
+        target = np.arange(0, 10_000, 1000, dtype=np.int64)
+
+        assert type(synchronizer._calculate_best_offset(target + 10, target)) is int
+
+
+class TestSyncWithOffset:
+    """Tests for the offset-based fallback."""
+
+    def test_crlf_target(self, synchronizer, tmp_path):
+        """Test CRLF line endings do not leak carriage returns into events."""
+        ref = _write_srt(tmp_path / "ref.srt", [(2000, 3000, "Hello"), (5000, 6000, "World")])
+        target = _write_srt(
+            tmp_path / "target.srt",
+            [(1000, 2000, "Line one\nLine two"), (4000, 5000, "Bye")],
+            newline="\r\n",
+        )
+        output = tmp_path / "out.srt"
+
+        result = synchronizer._sync_with_offset(str(ref), str(target), str(output))
+
+        assert result.offset_ms == 1000
+        assert result.error is None
+        subs = pysubs2.load(str(output))
+        assert [line.text for line in subs] == ["Line one\\NLine two", "Bye"]
+        assert b"\r" not in output.read_bytes()
+
+    def test_negative_offset(self, synchronizer, tmp_path):
+        """Test a late target is shifted earlier."""
+        ref = _write_srt(tmp_path / "ref.srt", [(1000, 2000, "A"), (4000, 5000, "B"), (8000, 9000, "C")])
+        target = _write_srt(tmp_path / "target.srt", [(3000, 4000, "A"), (6000, 7000, "B"), (10000, 11000, "C")])
+        output = tmp_path / "out.srt"
+
+        result = synchronizer._sync_with_offset(str(ref), str(target), str(output))
+
+        assert result.success is True
+        assert result.method == SyncMethod.MANUAL_OFFSET
+        assert result.offset_ms == -2000
+        subs = pysubs2.load(str(output))
+        assert [(line.start, line.end) for line in subs] == [(1000, 2000), (4000, 5000), (8000, 9000)]
+
+    def test_negative_offset_clamps_at_zero(self, synchronizer, tmp_path):
+        """Test timestamps that would go negative become 0."""
+        ref = _write_srt(tmp_path / "ref.srt", [(0, 500, "A"), (1000, 1500, "B")])
+        target = _write_srt(tmp_path / "target.srt", [(1200, 1800, "A"), (2200, 2700, "B")])
+        output = tmp_path / "out.srt"
+
+        result = synchronizer._sync_with_offset(str(ref), str(target), str(output))
+
+        assert result.offset_ms == -1200
+        subs = pysubs2.load(str(output))
+        assert [(line.start, line.end) for line in subs] == [(0, 600), (1000, 1500)]
+
+    def test_empty_target_copied(self, synchronizer, tmp_path):
+        """Test an empty target is copied unchanged with low confidence."""
+        ref = _write_srt(tmp_path / "ref.srt", [(1000, 2000, "A")])
+        target = tmp_path / "target.srt"
+        target.write_bytes(b"")
+        output = tmp_path / "out.srt"
+
+        result = synchronizer._sync_with_offset(str(ref), str(target), str(output))
+
+        assert result.success is True
+        assert result.offset_ms == 0
+        assert result.confidence == 0.1
+        assert output.read_bytes() == b""
+
+    def test_zero_offset_copies_same_format(self, synchronizer, tmp_path):
+        """Test an aligned target is copied byte for byte when formats match."""
+        events = [(1000, 2000, "Hello"), (4000, 5000, "World")]
+        ref = _write_srt(tmp_path / "ref.srt", events)
+        target = _write_srt(tmp_path / "target.srt", events, newline="\r\n")
+        output = tmp_path / "out.srt"
+
+        result = synchronizer._sync_with_offset(str(ref), str(target), str(output))
+
+        assert result.offset_ms == 0
+        assert output.read_bytes() == target.read_bytes()
+
+    def test_zero_offset_converts_other_format(self, synchronizer, tmp_path):
+        """Test an aligned non-SRT target is written in the output's format."""
+        events = [(1000, 2000, "Hello"), (4000, 5000, "World")]
+        ref = _write_srt(tmp_path / "ref.srt", events)
+        target = tmp_path / "target.ass"
+        subs = pysubs2.SSAFile()
+        for start, end, text in events:
+            subs.append(pysubs2.SSAEvent(start=start, end=end, text=text))
+        subs.save(str(target))
+        output = tmp_path / "out.srt"
+
+        result = synchronizer._sync_with_offset(str(ref), str(target), str(output))
+
+        assert result.offset_ms == 0
+        assert result.error is None
+        converted = pysubs2.SSAFile.from_string(output.read_text(encoding="utf-8"))
+        assert converted.format == "srt"
+        assert [(line.start, line.end, line.text) for line in converted] == events
+
+
+# Child that starts a grandchild sharing its pipes, then hangs
+_HANGING_PARENT = (
+    "import subprocess, sys, time;"
+    "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']);"
+    "print('working', flush=True);"
+    "time.sleep(60)"
+)
+
+
+class TestSyncWithFFSubsync:
+    """Tests for the ffsubsync subprocess path."""
+
+    def test_timeout_with_grandchild_holding_pipes(self, synchronizer, tmp_path, monkeypatch):
+        """Test a timeout returns promptly even if a grandchild keeps the pipes open."""
+        monkeypatch.setattr(
+            SimplifiedSubtitleSynchronizer, "_ffsubsync_command",
+            lambda self, *args: [sys.executable, "-c", _HANGING_PARENT]
+        )
+        started = time.monotonic()
+
+        result = synchronizer._sync_with_ffsubsync(
+            "ref.srt", "target.srt", str(tmp_path / "out.srt"), timeout=1
+        )
+
+        assert result.success is False
+        assert "timed out" in result.error
+        assert time.monotonic() - started < 10
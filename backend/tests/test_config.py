@@ -6,7 +6,9 @@ import pytest
 import tempfile
 from pathlib import Path
 
-from config import SubtitleConfig, PlexConfig, AppConfig, Settings
+from pydantic import ValidationError
+
+from config import SubtitleConfig, PlexConfig, AppConfig, Settings, get_settings
 
 
 class TestSubtitleConfig:
@@ -40,6 +42,13 @@ class TestSubtitleConfig:
         assert config.primary_color == "#FFFFFF"
         assert config.secondary_color == "#FFFF00"
 
+    def test_config_is_frozen(self):
+        """Test configuration cannot be mutated after load."""
+        config = SubtitleConfig()
+
+        with pytest.raises(ValidationError):
+            config.sync_timeout_seconds = 1
+
 
 class TestPlexConfig:
     """Tests for PlexConfig."""
@@ -108,6 +117,16 @@ class TestAppConfig:
             assert config.temp_dir == custom_path
             assert config.temp_dir.exists()
 
+    def test_deleted_temp_dir_recreated(self, tmp_path):
+        """Test a directory removed at runtime is created again on reload."""
+        custom_path = tmp_path / "custom_temp"
+        AppConfig(temp_dir=custom_path)
+        custom_path.rmdir()
+
+        AppConfig(temp_dir=custom_path)
+
+        assert custom_path.is_dir()
+
     def test_backup_dir_none_by_default(self):
         """Test backup directory is None by default."""
         config = AppConfig()
@@ -124,6 +143,10 @@ class TestSettings:
 
         assert settings1 is settings2
 
+    def test_get_settings_returns_singleton(self):
+        """Test the cached factory and the constructor agree."""
+        assert get_settings() is Settings()
+
     def test_settings_has_all_configs(self):
         """Test Settings has all config objects."""
         settings = Settings()
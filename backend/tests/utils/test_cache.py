@@ -2,6 +2,7 @@
 Tests for utils/cache.py
 """
 
+import threading
 import time
 import pytest
 from utils.cache import TTLCache
@@ -107,14 +108,53 @@ class TestTTLCache:
         # Wait for expiration
         time.sleep(1.1)
 
-        # Add a new non-expired entry
-        cache.set("key3", "value3")
-
         # Cleanup should remove expired entries
         removed = cache.cleanup_expired()
 
         assert removed == 2  # key1 and key2 expired
+        assert cache.size == 0
+
+    def test_set_purges_expired_entries(self):
+        """Test writes retire expired entries without an explicit cleanup."""
+        cache = TTLCache[str](ttl_seconds=1, max_size=2)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+
+        time.sleep(1.1)
+
+        # Add a new non-expired entry
+        cache.set("key3", "value3")
+
+        assert cache.size == 1
         assert cache.get("key3") == "value3"  # key3 still valid
+        assert cache.cleanup_expired() == 0
+
+    def test_cleanup_in_batches(self):
+        """Test max_batch caps each cleanup call."""
+        cache = TTLCache[int](ttl_seconds=1, max_size=10)
+        for i in range(5):
+            cache.set(f"key{i}", i)
+
+        time.sleep(1.1)
+
+        assert cache.cleanup_expired(max_batch=2) == 2
+        assert cache.size == 3
+        assert cache.cleanup_expired(max_batch=2) == 2
+        assert cache.cleanup_expired(max_batch=2) == 1
+        assert cache.cleanup_expired(max_batch=2) == 0
+
+    def test_cleanup_skips_refreshed_entries(self):
+        """Test re-setting a key moves its expiry past the original deadline."""
+        cache = TTLCache[str](ttl_seconds=1, max_size=10)
+        cache.set("key1", "value1")
+
+        time.sleep(0.6)
+        cache.set("key1", "refreshed")
+        time.sleep(0.6)
+
+        # The first deadline has passed, but the entry was renewed
+        assert cache.cleanup_expired() == 0
+        assert cache.get("key1") == "refreshed"
 
     def test_size_property(self):
         """Test size property."""
@@ -145,6 +185,19 @@ class TestTTLCache:
         assert stats['ttl_seconds'] == 60
         assert stats['expired_entries'] == 0
 
+    def test_stats_counts_expired_entries(self):
+        """Test expired entries are counted until they are purged."""
+        cache = TTLCache[str](ttl_seconds=1, max_size=10)
+        cache.set("key1", "value1")
+        cache.set("key1", "value1")  # stale heap item for the same key
+        cache.set("key2", "value2")
+
+        time.sleep(1.1)
+
+        assert cache.stats()['expired_entries'] == 2
+        cache.cleanup_expired()
+        assert cache.stats()['expired_entries'] == 0
+
     def test_update_existing_key(self):
         """Test updating an existing key."""
         cache = TTLCache[str](ttl_seconds=60, max_size=10)
@@ -154,6 +207,17 @@ class TestTTLCache:
         assert cache.get("key1") == "updated_value"
         assert cache.size == 1  # Still only one entry
 
+    def test_update_at_capacity_does_not_evict(self):
+        """Test overwriting a key in a full cache keeps the other entries."""
+        cache = TTLCache[str](ttl_seconds=60, max_size=2)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+
+        cache.set("key2", "updated_value")
+
+        assert cache.get("key1") == "value1"
+        assert cache.get("key2") == "updated_value"
+
     def test_typed_cache(self):
         """Test cache with specific types."""
         # Dict cache
@@ -165,3 +229,40 @@ class TestTTLCache:
         int_cache = TTLCache[int](ttl_seconds=60, max_size=10)
         int_cache.set("key1", 42)
         assert int_cache.get("key1") == 42
+
+    def test_get_does_not_block_on_held_lock(self):
+        """Test hits are served while another thread holds the lock."""
+        cache = TTLCache[str](ttl_seconds=60, max_size=10)
+        cache.set("key1", "value1")
+
+        with cache._lock:
+            assert cache.get("key1") == "value1"
+            assert cache.get("missing") is None
+
+    def test_concurrent_get_and_delete(self):
+        """Test lock-free reads tolerate keys deleted by other threads."""
+        cache = TTLCache[int](ttl_seconds=60, max_size=50)
+        errors = []
+
+        def writer():
+            for i in range(2000):
+                cache.set(f"k{i % 20}", i)
+                cache.delete(f"k{(i + 7) % 20}")
+
+        def reader():
+            try:
+                for i in range(2000):
+                    cache.get(f"k{i % 20}")
+            except Exception as e:  # pragma: no cover - failure path
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer)] + [
+            threading.Thread(target=reader) for _ in range(3)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert cache.size <= 20
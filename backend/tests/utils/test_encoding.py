@@ -0,0 +1,119 @@
+"""
+Tests for utils/encoding.py
+"""
+
+import codecs
+import io
+
+import utils.encoding as encoding_module
+from utils.encoding import (
+    ENCODING_SAMPLE_BYTES,
+    clear_encoding_cache,
+    decode_subtitle_bytes,
+    detect_bom,
+    detect_file_encoding,
+    detect_stream_encoding,
+)
+
+
+class TestDetectBom:
+    """Tests for detect_bom function."""
+
+    def test_utf8_bom(self):
+        """Test UTF-8 BOM maps to the BOM-stripping codec."""
+        assert detect_bom(codecs.BOM_UTF8 + b"1\n") == 'utf-8-sig'
+
+    def test_utf32_checked_before_utf16(self):
+        """Test UTF-32 LE is not mistaken for UTF-16 LE (shared prefix)."""
+        assert detect_bom("hi".encode('utf-32')[:4]) == 'utf-32'
+        assert detect_bom("hi".encode('utf-16')[:4]) == 'utf-16'
+
+    def test_no_bom(self):
+        """Test plain bytes have no BOM."""
+        assert detect_bom(b"1\n00:00") is None
+
+
+class TestDetectStreamEncoding:
+    """Tests for detect_stream_encoding function."""
+
+    def test_bom_short_circuits(self):
+        """Test a BOM is answered from the first bytes only."""
+        stream = io.BytesIO(codecs.BOM_UTF8 + b"x" * 100)
+
+        assert detect_stream_encoding(stream) == 'utf-8-sig'
+        assert stream.tell() == 4
+
+    def test_detects_utf8(self):
+        """Test UTF-8 text without a BOM."""
+        content = "1\n00:00:01,000 --> 00:00:02,000\nこんにちは\n" * 20
+        assert detect_stream_encoding(io.BytesIO(content.encode('utf-8'))).lower() == 'utf-8'
+
+    def test_empty_stream_defaults_to_utf8(self):
+        """Test empty input falls back to UTF-8."""
+        assert detect_stream_encoding(io.BytesIO(b"")) == 'utf-8'
+
+    def test_reads_at_most_sample(self):
+        """Test large inputs are not read past the sample cap."""
+        stream = io.BytesIO(b"plain ascii subtitle text\n" * 20000)
+        detect_stream_encoding(stream)
+
+        assert stream.tell() <= ENCODING_SAMPLE_BYTES
+
+    def test_utf8_skips_detector(self, monkeypatch):
+        """Test clean UTF-8 is answered without acquiring a chardet detector."""
+        def no_detector():
+            raise AssertionError("detector acquired for UTF-8 input")
+
+        monkeypatch.setattr(encoding_module, "_acquire_detector", no_detector)
+        content = "1\n00:00:01,000 --> 00:00:02,000\nこんにちは\n" * 2000
+
+        assert detect_stream_encoding(io.BytesIO(content.encode('utf-8'))) == 'utf-8'
+
+    def test_late_non_utf8_uses_detector(self, monkeypatch):
+        """Test bytes that stop being UTF-8 after the first chunk still reach chardet."""
+        acquired = []
+        real_acquire = encoding_module._acquire_detector
+
+        def spy():
+            acquired.append(True)
+            return real_acquire()
+
+        monkeypatch.setattr(encoding_module, "_acquire_detector", spy)
+        data = b"plain ascii line\n" * 500 + ("こんにちは、世界。" * 200).encode('shift_jis')
+
+        assert detect_stream_encoding(io.BytesIO(data)).lower() != 'utf-8'
+        assert acquired == [True]
+
+    def test_reused_detector_starts_clean(self):
+        """Test a pooled detector does not carry state between streams."""
+        sjis = ("こんにちは、世界。" * 40).encode('shift_jis')
+        assert detect_stream_encoding(io.BytesIO(sjis)).lower() == 'shift_jis'
+
+        content = "1\n00:00:01,000 --> 00:00:02,000\nこんにちは\n" * 20
+        assert detect_stream_encoding(io.BytesIO(content.encode('utf-8'))).lower() == 'utf-8'
+
+
+class TestDetectFileEncoding:
+    """Tests for detect_file_encoding function."""
+
+    def test_rewritten_file_is_redetected(self, tmp_path):
+        """Test the cache key follows file changes."""
+        clear_encoding_cache()
+        path = tmp_path / "ep.srt"
+        path.write_bytes(codecs.BOM_UTF8 + b"1\n")
+        assert detect_file_encoding(path) == 'utf-8-sig'
+
+        path.write_bytes("hi there".encode('utf-16'))
+        assert detect_file_encoding(path) == 'utf-16'
+
+
+class TestDecodeSubtitleBytes:
+    """Tests for decode_subtitle_bytes function."""
+
+    def test_translates_line_endings(self):
+        """Test CRLF and lone CR become plain newlines."""
+        assert decode_subtitle_bytes(b"1\r\nHello\rWorld\n", 'utf-8') == "1\nHello\nWorld\n"
+
+    def test_replace_errors(self):
+        """Test undecodable bytes are replaced when asked."""
+        assert decode_subtitle_bytes(b"caf\xe9", 'utf-8', 'replace') == "caf\ufffd"
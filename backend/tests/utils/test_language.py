@@ -38,6 +38,11 @@ class TestExtractLanguagesFromFilename:
         assert "zh-hant" in extract_languages_from_filename("ShowName.S01E01.zht.srt")
         assert "zh-hant" in extract_languages_from_filename("ShowName.S01E01.traditional.srt")
 
+    def test_hyphenated_alias_keeps_base_language(self):
+        """Test a hyphenated tag reports both its parts' matches, in table order."""
+        assert extract_languages_from_filename("ShowName.S01E01.zh-TW.srt") == ["zh", "zh-hant"]
+        assert extract_languages_from_filename("ShowName.S01E01.pt-br.srt") == ["pt", "pt-br"]
+
     def test_multiple_languages(self):
         """Test detection of multiple languages in filename."""
         result = extract_languages_from_filename("ShowName.S01E01.en.ja.dual.srt")
@@ -94,6 +99,12 @@ class TestExtractLanguageFromSubtitleParts:
         result = extract_language_from_subtitle_parts(parts, "ShowName.S01E01")
         assert result is None
 
+    def test_codes_are_shared(self):
+        """Test repeated scans return one shared object per code."""
+        first = extract_language_from_subtitle_parts(["Show", "S01E01", "zh", "TW"], "Show")
+        second = extract_language_from_subtitle_parts(["Show", "S01E02", "ZH", "tw"], "Show")
+        assert first is second
+
 
 class TestNormalizeLanguageCode:
     """Tests for normalize_language_code function."""
@@ -2,12 +2,17 @@
 Tests for utils/network.py
 """
 
+import socket
+
 import pytest
+from utils import network
 from utils.network import (
+    clear_local_ip_cache,
     get_local_ip,
     is_local_origin,
     get_cors_origins,
     get_cors_regex,
+    get_cors_pattern,
 )
 
 
@@ -29,6 +34,46 @@ class TestGetLocalIp:
             assert part.isdigit()
             assert 0 <= int(part) <= 255
 
+    def test_result_is_cached(self, monkeypatch):
+        """Test the socket lookup runs once until the cache is cleared."""
+        calls = []
+
+        class FakeSocket:
+            def __init__(self, *args):
+                calls.append(args)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def connect(self, address):
+                pass
+
+            def getsockname(self):
+                return ("192.168.1.50", 40000)
+
+        monkeypatch.setattr(socket, "socket", FakeSocket)
+        clear_local_ip_cache()
+        try:
+            assert get_local_ip() == "192.168.1.50"
+            assert get_local_ip() == "192.168.1.50"
+            assert len(calls) == 1
+
+            clear_local_ip_cache()
+            get_local_ip()
+            assert len(calls) == 2
+
+            # The cached address expires after the TTL
+            monkeypatch.setattr(network, "LOCAL_IP_TTL_SECONDS", 0)
+            clear_local_ip_cache()
+            get_local_ip()
+            get_local_ip()
+            assert len(calls) == 4
+        finally:
+            clear_local_ip_cache()
+
 
 class TestIsLocalOrigin:
     """Tests for is_local_origin function."""
@@ -95,14 +140,28 @@ class TestIsLocalOrigin:
         assert is_local_origin("http://example.com:5173") is False
         assert is_local_origin("http://google.com") is False
 
+    def test_ipv6(self):
+        """Test IPv6 loopback and unique local origins."""
+        assert is_local_origin("http://[::1]:5173") is True
+        assert is_local_origin("http://[fd12:3456::1]:3000") is True
+        assert is_local_origin("http://[::ffff:192.168.1.1]:5173") is True
+        assert is_local_origin("http://[2001:db8::1]:5173") is False
+        assert is_local_origin("http://[::ffff:8.8.8.8]:5173") is False
+
+    def test_private_prefix_lookalike_rejected(self):
+        """Test hostnames that merely start with a private IP are rejected."""
+        assert is_local_origin("http://192.168.1.1.example.com") is False
+        assert is_local_origin("http://10.evil.com:5173") is False
+
 
 class TestGetCorsOrigins:
     """Tests for get_cors_origins function."""
 
-    def test_returns_list(self):
-        """Test that get_cors_origins returns a list."""
+    def test_returns_tuple(self):
+        """Test that get_cors_origins returns an immutable, cached tuple."""
         result = get_cors_origins("192.168.1.100")
-        assert isinstance(result, list)
+        assert isinstance(result, tuple)
+        assert get_cors_origins("192.168.1.100") is result
 
     def test_includes_localhost(self):
         """Test that localhost origins are included."""
@@ -122,6 +181,11 @@ class TestGetCorsOrigins:
         assert "http://192.168.1.100:5173" in result
         assert "http://192.168.1.100:3000" in result
 
+    def test_defaults_to_detected_ip(self):
+        """Test the local IP defaults to get_local_ip()."""
+        result = get_cors_origins()
+        assert f"http://{get_local_ip()}:5173" in result
+
 
 class TestGetCorsRegex:
     """Tests for get_cors_regex function."""
@@ -162,3 +226,56 @@ class TestGetCorsRegex:
 
         assert re.match(pattern, "http://example.com:5173") is None
         assert re.match(pattern, "http://8.8.8.8:3000") is None
+
+    def test_compiled_pattern_matches_regex(self):
+        """Test the compiled pattern is the same pattern, built once."""
+        pattern = get_cors_pattern()
+
+        assert pattern is get_cors_pattern()
+        assert pattern.pattern == get_cors_regex()
+        assert pattern.match("http://192.168.1.1:5173") is not None
+        assert pattern.match("http://example.com:5173") is None
+
+
+class TestCorsRegexMatchesIsLocalOrigin:
+    """Tests that the CORS regex and is_local_origin accept the same origins."""
+
+    # "null" is left out: it is special-cased by is_local_origin only
+    ORIGINS = [
+        "http://localhost",
+        "http://localhost:5173",
+        "https://localhost:3000",
+        "http://127.0.0.1:5173",
+        "http://127.1.2.3:8080",
+        "http://10.0.0.1",
+        "http://192.168.1.1:5173",
+        "http://172.16.0.1:5173",
+        "http://172.31.255.255",
+        "http://172.15.0.1:5173",
+        "http://172.32.0.1",
+        "http://myserver.local:5173",
+        "http://plex.home.local",
+        "http://[::1]:5173",
+        "http://[::1]",
+        "http://[fd12:3456::1]:3000",
+        "http://[::ffff:192.168.1.1]:5173",
+        "http://[::ffff:c0a8:101]:5173",
+        "http://[::ffff:7f00:1]",
+        "http://[2001:db8::1]:5173",
+        "http://[fe80::1]:5173",
+        "http://[::ffff:8.8.8.8]",
+        "http://[::ffff:808:808]",
+        "http://8.8.8.8:5173",
+        "http://example.com:5173",
+        "http://192.168.1.1.example.com",
+        "http://10.evil.com:5173",
+        "http://192.168.1.300",
+        "http://10.1:5173",
+    ]
+
+    def test_same_origins_accepted(self):
+        """Test both checks agree on every origin in the list."""
+        pattern = get_cors_pattern()
+
+        for origin in self.ORIGINS:
+            assert (pattern.fullmatch(origin) is not None) == is_local_origin(origin), origin
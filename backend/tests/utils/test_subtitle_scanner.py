@@ -2,6 +2,9 @@
 Tests for utils/subtitle_scanner.py
 """
 
+import dataclasses
+import sys
+
 import pytest
 import tempfile
 from pathlib import Path
@@ -12,6 +15,7 @@ from utils.subtitle_scanner import (
     detect_dual_subtitle,
     SubtitleFileInfo,
     SUBTITLE_EXTENSIONS,
+    get_subtitle_extensions,
 )
 
 
@@ -26,6 +30,17 @@ class TestSubtitleExtensions:
         assert '.vtt' in SUBTITLE_EXTENSIONS
         assert '.sub' in SUBTITLE_EXTENSIONS
 
+    def test_is_immutable(self):
+        """Test the shared extension set cannot be modified by callers."""
+        assert isinstance(SUBTITLE_EXTENSIONS, frozenset)
+
+    def test_get_subtitle_extensions(self):
+        """Test the accessor returns every extension as a stable tuple."""
+        result = get_subtitle_extensions()
+
+        assert result == tuple(sorted(SUBTITLE_EXTENSIONS))
+        assert get_subtitle_extensions() is result
+
 
 class TestDetectDualSubtitle:
     """Tests for detect_dual_subtitle function."""
@@ -114,6 +129,27 @@ class TestParseSubtitleFilename:
             assert result is not None
             assert result.language_code is None
 
+    def test_repeat_parse_returns_independent_lists(self):
+        """Test memoized parses do not share mutable dual-language lists."""
+        first = parse_subtitle_filename("/a/ShowName.S01E01.dual.ja.en.ass", "ShowName.S01E01")
+        first.dual_languages.append("fr")
+
+        second = parse_subtitle_filename("/b/ShowName.S01E01.dual.ja.en.ass", "ShowName.S01E01")
+
+        assert second.dual_languages == ["ja", "en"]
+        assert second.file_path == "/b/ShowName.S01E01.dual.ja.en.ass"
+
+    def test_accepts_string_path(self):
+        """Test a plain string path is parsed and kept as given."""
+        path = "/media/tv/ShowName.S01E01.ja.ass"
+
+        result = parse_subtitle_filename(path, "ShowName.S01E01")
+
+        assert result.file_path == path
+        assert result.file_name == "ShowName.S01E01.ja.ass"
+        assert result.language_code == "ja"
+        assert result.format == "ASS"
+
 
 class TestScanDirectoryForSubtitles:
     """Tests for scan_directory_for_subtitles function."""
@@ -146,6 +182,29 @@ class TestScanDirectoryForSubtitles:
             assert len(results) == 1
             assert results[0].file_name == "ShowName.S01E01.en.srt"
 
+    def test_ignores_longer_names_sharing_prefix(self):
+        """Test a video name that only prefixes another name does not match."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "ShowName.S01E01.en.srt").touch()  # Match
+            (Path(tmpdir) / "ShowName.S01E010.en.srt").touch()  # Episode 10
+
+            results = scan_directory_for_subtitles(tmpdir, "ShowName.S01E01")
+
+            assert [r.file_name for r in results] == ["ShowName.S01E01.en.srt"]
+
+    def test_accepts_separators_after_video_name(self):
+        """Test names joined to the video name by '_', '-' or ' ' still match."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ("Movie_en.srt", "Movie-eng.srt", "Movie en.srt", "Movie.en.srt"):
+                (Path(tmpdir) / name).touch()
+            (Path(tmpdir) / "Movies.en.srt").touch()  # Different video
+
+            results = scan_directory_for_subtitles(tmpdir, "Movie")
+
+            assert sorted(r.file_name for r in results) == [
+                "Movie en.srt", "Movie-eng.srt", "Movie.en.srt", "Movie_en.srt"
+            ]
+
     def test_ignores_non_subtitle_files(self):
         """Test that non-subtitle files are ignored."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -217,3 +276,31 @@ class TestSubtitleFileInfo:
         assert result['is_dual_subtitle'] is True
         assert result['dual_languages'] == ["ja", "en"]
         assert result['language_code'] is None
+
+    def test_is_frozen(self):
+        """Test infos are immutable once built."""
+        info = SubtitleFileInfo(
+            file_path="/path/to/file.srt",
+            file_name="file.srt",
+            language_code="en",
+            format="SRT",
+            is_dual_subtitle=False,
+            dual_languages=None,
+        )
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            info.language_code = "ja"
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need 3.10+")
+    def test_uses_slots(self):
+        """Test infos carry no per-instance __dict__."""
+        info = SubtitleFileInfo(
+            file_path="/path/to/file.srt",
+            file_name="file.srt",
+            language_code="en",
+            format="SRT",
+            is_dual_subtitle=False,
+            dual_languages=None,
+        )
+
+        assert not hasattr(info, '__dict__')
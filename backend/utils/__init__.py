@@ -1,24 +1,37 @@
 """
 Utility modules for PlexDualSub backend
+
+Exports are resolved lazily (PEP 562), so importing one submodule such as
+utils.encoding does not load the others.
 """
 
-from .network import get_local_ip, is_local_origin
-from .language import extract_languages_from_filename
-from .cache import TTLCache
-from .subtitle_scanner import (
-    scan_directory_for_subtitles,
-    parse_subtitle_filename,
-    SubtitleFileInfo,
-    SUBTITLE_EXTENSIONS,
-)
-
-__all__ = [
-    "get_local_ip",
-    "is_local_origin",
-    "extract_languages_from_filename",
-    "TTLCache",
-    "scan_directory_for_subtitles",
-    "parse_subtitle_filename",
-    "SubtitleFileInfo",
-    "SUBTITLE_EXTENSIONS",
-]
+import importlib
+from typing import Any
+
+# Exported name -> submodule that defines it
+_LAZY_EXPORTS = {
+    "get_local_ip": ".network",
+    "is_local_origin": ".network",
+    "extract_languages_from_filename": ".language",
+    "TTLCache": ".cache",
+    "scan_directory_for_subtitles": ".subtitle_scanner",
+    "parse_subtitle_filename": ".subtitle_scanner",
+    "SubtitleFileInfo": ".subtitle_scanner",
+    "SUBTITLE_EXTENSIONS": ".subtitle_scanner",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,10 +2,10 @@
 TTL Cache implementation with bounded size
 """
 
+import heapq
 import time
 import logging
-from typing import Any, Dict, Optional, TypeVar, Generic
-from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, TypeVar, Generic
 from threading import Lock
 
 logger = logging.getLogger(__name__)
@@ -28,6 +28,9 @@ class TTLCache(Generic[T]):
         value = cache.get("key")  # Returns None if expired
     """
 
+    # Most expired entries retired by a single set()
+    PURGE_BUDGET = 8
+
     def __init__(
         self,
         ttl_seconds: int = 300,
@@ -45,7 +48,13 @@ class TTLCache(Generic[T]):
         self._ttl = ttl_seconds
         self._max_size = max_size
         self._name = name
-        self._cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        # Plain dicts keep insertion order: the first key is the least
+        # recently used, and re-inserting a key makes it the most recent
+        # Entries are (value, expires_at) tuples
+        self._cache: Dict[str, Tuple[T, float]] = {}
+        # (expires_at, key) min-heap; entries go stale on update/delete and
+        # are skipped when popped
+        self._expiry_heap: List[Tuple[float, str]] = []
         self._lock = Lock()
 
     def get(self, key: str) -> Optional[T]:
@@ -58,20 +67,31 @@ class TTLCache(Generic[T]):
         Returns:
             Cached value if exists and not expired, None otherwise
         """
-        with self._lock:
-            if key not in self._cache:
-                return None
-
-            entry = self._cache[key]
-            if time.time() - entry['timestamp'] > self._ttl:
-                # Entry expired, remove it
-                del self._cache[key]
-                logger.debug(f"[{self._name}] Cache entry expired: {key[:20]}...")
-                return None
-
-            # Move to end (most recently used)
-            self._cache.move_to_end(key)
-            return entry['value']
+        # A single dict lookup is atomic under the GIL (CPython) and entries
+        # are immutable tuples, so reads need no lock; only mutations below
+        # take it. A lookup racing a reorder may miss, which only costs the
+        # caller a recompute
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        if time.monotonic() > entry[1]:
+            with self._lock:
+                # Entry expired, remove it (unless a set() has replaced it)
+                if self._cache.get(key) is entry:
+                    del self._cache[key]
+            logger.debug(f"[{self._name}] Cache entry expired: {key[:20]}...")
+            return None
+
+        # Move to end (most recently used) only if the lock is free: under
+        # contention the LRU order is approximate rather than blocking reads
+        if self._lock.acquire(blocking=False):
+            try:
+                if self._cache.get(key) is entry:
+                    self._cache[key] = self._cache.pop(key)
+            finally:
+                self._lock.release()
+        return entry[0]
 
     def set(self, key: str, value: T) -> None:
         """
@@ -82,18 +102,34 @@ class TTLCache(Generic[T]):
             value: Value to cache
         """
         with self._lock:
-            # Remove oldest entries if at capacity
-            while len(self._cache) >= self._max_size:
-                oldest_key = next(iter(self._cache))
-                del self._cache[oldest_key]
-                logger.debug(f"[{self._name}] Evicted oldest entry: {oldest_key[:20]}...")
+            # Monotonic: wall-clock jumps must not expire or revive entries
+            now = time.monotonic()
+
+            # Amortized cleanup: each write retires a few expired entries
+            # (before any LRU eviction), so no periodic full pass is needed
+            self._purge_expired(now, budget=self.PURGE_BUDGET)
+
+            if key in self._cache:
+                # Updating never needs room; dropping the key first makes
+                # the assignment below re-insert it as most recent
+                del self._cache[key]
+            else:
+                # Remove oldest entries if at capacity
+                while len(self._cache) >= self._max_size:
+                    oldest_key = next(iter(self._cache))
+                    del self._cache[oldest_key]
+                    logger.debug(f"[{self._name}] Evicted oldest entry: {oldest_key[:20]}...")
 
             # Add or update entry
-            self._cache[key] = {
-                'value': value,
-                'timestamp': time.time()
-            }
-            self._cache.move_to_end(key)
+            expires_at = now + self._ttl
+            self._cache[key] = (value, expires_at)
+
+            heap = self._expiry_heap
+            heapq.heappush(heap, (expires_at, key))
+            if len(heap) > 2 * self._max_size:
+                # Too many stale entries from updates/evictions; rebuild
+                heap[:] = [(entry[1], k) for k, entry in self._cache.items()]
+                heapq.heapify(heap)
 
     def delete(self, key: str) -> bool:
         """
@@ -106,38 +142,74 @@ class TTLCache(Generic[T]):
             True if key existed and was deleted
         """
         with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                return True
-            return False
+            return self._cache.pop(key, None) is not None
 
     def clear(self) -> None:
         """Clear all entries from the cache."""
         with self._lock:
             self._cache.clear()
+            self._expiry_heap.clear()
             logger.debug(f"[{self._name}] Cache cleared")
 
-    def cleanup_expired(self) -> int:
+    def cleanup_expired(self, max_batch: Optional[int] = None) -> int:
         """
-        Remove all expired entries.
+        Remove expired entries.
+
+        Args:
+            max_batch: Most entries to remove in this call, bounding how long
+                the lock is held; None removes all. Large sweeps can run as
+                ``while cache.cleanup_expired(256): pass`` so other callers
+                get the lock between batches.
 
         Returns:
             Number of entries removed
         """
         with self._lock:
-            now = time.time()
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if now - entry['timestamp'] > self._ttl
-            ]
+            removed = self._purge_expired(time.monotonic(), max_batch)
 
-            for key in expired_keys:
-                del self._cache[key]
+            if removed:
+                logger.debug(f"[{self._name}] Cleaned up {removed} expired entries")
 
-            if expired_keys:
-                logger.debug(f"[{self._name}] Cleaned up {len(expired_keys)} expired entries")
+            return removed
 
-            return len(expired_keys)
+    def _purge_expired(self, now: float, budget: Optional[int] = None) -> int:
+        """Remove expired entries (at most ``budget``); caller holds the lock"""
+        heap = self._expiry_heap
+        removed = 0
+
+        # Only entries that have actually expired are visited. The budget
+        # counts removals, so a batch that returns 0 really found nothing;
+        # stale items are popped once each and the heap is capped anyway.
+        while heap and heap[0][0] < now and (budget is None or removed < budget):
+            expires_at, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            if entry is not None and entry[1] == expires_at:
+                del self._cache[key]
+                removed += 1
+
+        return removed
+
+    def _count_expired(self, now: float) -> int:
+        """Count live expired entries; caller holds the lock"""
+        heap = self._expiry_heap
+        cache = self._cache
+        # A key re-added at the same clock reading has two matching items
+        counted = set()
+
+        # A heap node never expires before its parent, so only the expired
+        # top of the heap is walked, not every entry
+        stack = [0] if heap else []
+        while stack:
+            i = stack.pop()
+            expires_at, key = heap[i]
+            if expires_at >= now:
+                continue
+            entry = cache.get(key)
+            if entry is not None and entry[1] == expires_at:
+                counted.add(key)
+            stack.extend(c for c in (2 * i + 1, 2 * i + 2) if c < len(heap))
+
+        return len(counted)
 
     @property
     def size(self) -> int:
@@ -152,11 +224,7 @@ class TTLCache(Generic[T]):
             Dict with cache stats
         """
         with self._lock:
-            now = time.time()
-            expired_count = sum(
-                1 for entry in self._cache.values()
-                if now - entry['timestamp'] > self._ttl
-            )
+            expired_count = self._count_expired(time.monotonic())
 
             return {
                 'name': self._name,
@@ -0,0 +1,10 @@
+"""
+Compatibility shims for older supported Python versions
+"""
+
+import sys
+from typing import Any, Dict
+
+# Spread into @dataclass(...): drops the per-instance __dict__ where
+# dataclasses support slots (3.10+), a no-op on older versions
+DATACLASS_SLOTS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
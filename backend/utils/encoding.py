@@ -0,0 +1,178 @@
+"""
+Subtitle file encoding detection
+"""
+
+import codecs
+import functools
+import io
+import os
+import queue
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Union
+
+try:
+    # C detector from faust-cchardet (installed alongside ffsubsync); optional
+    from cchardet import UniversalDetector
+    # Its reset() keeps the previous result, and a fresh one is cheap anyway
+    _REUSE_DETECTORS = False
+except ImportError:
+    from chardet.universaldetector import UniversalDetector
+    _REUSE_DETECTORS = True
+
+# Most bytes fed to the detector; a subtitle's head is enough to decide
+ENCODING_SAMPLE_BYTES = 64 * 1024
+ENCODING_CHUNK_BYTES = 4096
+
+# Byte-order marks; UTF-32 first since its LE mark starts with UTF-16's
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# Idle chardet detectors kept for reuse: their charset probers are built on
+# first use and reset() is cheaper than building them again for every file
+_idle_detectors: "queue.LifoQueue[UniversalDetector]" = queue.LifoQueue(maxsize=8)
+
+
+def _acquire_detector() -> UniversalDetector:
+    if not _REUSE_DETECTORS:
+        return UniversalDetector()
+    try:
+        detector = _idle_detectors.get_nowait()
+    except queue.Empty:
+        return UniversalDetector()
+    detector.reset()
+    return detector
+
+
+def _release_detector(detector: UniversalDetector) -> None:
+    if not _REUSE_DETECTORS:
+        return
+    try:
+        _idle_detectors.put_nowait(detector)
+    except queue.Full:
+        pass
+
+
+def detect_bom(head: bytes) -> Optional[str]:
+    """
+    Get the encoding implied by a byte-order mark.
+
+    Args:
+        head: First bytes of the file (4 are enough)
+
+    Returns:
+        A BOM-consuming codec name, or None if there is no BOM
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    return None
+
+
+def _detect_with_chardet(f: BinaryIO, sample: List[bytes], total: int) -> str:
+    """Run statistical detection over the bytes already read, then the rest of the sample"""
+    detector = _acquire_detector()
+    try:
+        for chunk in sample:
+            detector.feed(chunk)
+            if detector.done:
+                break
+        while not detector.done and total < ENCODING_SAMPLE_BYTES:
+            chunk = f.read(min(ENCODING_CHUNK_BYTES, ENCODING_SAMPLE_BYTES - total))
+            if not chunk:
+                break
+            detector.feed(chunk)
+            total += len(chunk)
+        detector.close()
+        return detector.result['encoding'] or 'utf-8'
+    finally:
+        _release_detector(detector)
+
+
+def detect_stream_encoding(f: BinaryIO) -> str:
+    """
+    Detect the encoding of a binary stream positioned at its start.
+
+    A BOM is answered without running chardet, and so is a sample that
+    decodes as strict UTF-8. Otherwise the stream is fed to chardet
+    (cchardet when installed) in chunks until it is confident or
+    ENCODING_SAMPLE_BYTES have been read, so large files are never read
+    whole.
+
+    Args:
+        f: File object opened in binary mode
+
+    Returns:
+        Encoding name (defaults to 'utf-8')
+    """
+    head = f.read(4)
+    encoding = detect_bom(head)
+    if encoding:
+        return encoding
+
+    # Most subtitles are plain UTF-8; only fall back to statistical
+    # detection once a chunk fails to decode. A multi-byte character cut
+    # at a chunk boundary is carried over by the incremental decoder.
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    sample = []
+    chunk, total = head, len(head)
+    while chunk:
+        sample.append(chunk)
+        try:
+            decoder.decode(chunk)
+        except UnicodeDecodeError:
+            return _detect_with_chardet(f, sample, total)
+        if total >= ENCODING_SAMPLE_BYTES:
+            break
+        chunk = f.read(min(ENCODING_CHUNK_BYTES, ENCODING_SAMPLE_BYTES - total))
+        total += len(chunk)
+    return 'utf-8'
+
+
+@functools.lru_cache(maxsize=4096)
+def _detect_file_encoding_cached(path: str, mtime_ns: int, size: int) -> str:
+    with open(path, 'rb') as f:
+        return detect_stream_encoding(f)
+
+
+def detect_file_encoding(path: Union[str, Path]) -> str:
+    """
+    Detect a file's encoding, memoized per (path, mtime, size).
+
+    Rewriting the file changes the key, so stale entries are never served.
+
+    Args:
+        path: Subtitle file path
+
+    Returns:
+        Encoding name (defaults to 'utf-8')
+    """
+    st = os.stat(path)
+    return _detect_file_encoding_cached(str(path), st.st_mtime_ns, st.st_size)
+
+
+def decode_subtitle_bytes(data: bytes, encoding: str, errors: str = 'strict') -> str:
+    """
+    Decode subtitle bytes with universal newlines, as open() would.
+
+    CRLF and lone CR line endings come back as plain newlines, so parsers
+    never see stray carriage returns.
+
+    Args:
+        data: Raw file contents
+        encoding: Codec to decode with
+        errors: Codec error handler
+
+    Returns:
+        Decoded text
+    """
+    return io.TextIOWrapper(io.BytesIO(data), encoding=encoding, errors=errors).read()
+
+
+def clear_encoding_cache() -> None:
+    """Forget all memoized file encodings"""
+    _detect_file_encoding_cached.cache_clear()
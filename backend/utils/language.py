@@ -2,9 +2,11 @@
 Language detection utilities for subtitle filenames
 """
 
+import functools
 import re
+import sys
 import logging
-from typing import List, Set, Optional
+from typing import Dict, FrozenSet, List, Set, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -33,24 +35,31 @@ KNOWN_LANGUAGE_CODES: Set[str] = {
     'vi', 'vie', 'vietnamese',
 }
 
-# Language patterns for regex matching in filenames
-LANGUAGE_PATTERNS = {
-    'en': r'\b(en|eng|english)\b',
-    'zh': r'\b(zh|chi|chinese|chs)\b',
-    'zh-hant': r'\b(zh-tw|zh-hk|zht|cht|tc|traditional)\b',
-    'es': r'\b(es|spa|spanish|espanol)\b',
-    'fr': r'\b(fr|fre|fra|french|francais)\b',
-    'de': r'\b(de|ger|deu|german|deutsch)\b',
-    'ja': r'\b(ja|jp|jpn|japanese)\b',
-    'ko': r'\b(ko|kr|kor|korean)\b',
-    'pt': r'\b(pt|por|portuguese)\b',
-    'pt-br': r'\b(pt-br|ptbr|pb|brazilian)\b',
-    'ru': r'\b(ru|rus|russian)\b',
-    'ar': r'\b(ar|ara|arabic)\b',
-    'it': r'\b(it|ita|italian)\b',
-    'nl': r'\b(nl|dut|nld|dutch)\b',
+# The 2-3 letter codes, so subtitle parts need a single membership test
+_SHORT_LANGUAGE_CODES = frozenset(c for c in KNOWN_LANGUAGE_CODES if len(c) in (2, 3))
+
+# Filename tokens per language; a token must appear as a whole word
+LANGUAGE_ALIASES: Dict[str, FrozenSet[str]] = {
+    'en': frozenset({'en', 'eng', 'english'}),
+    'zh': frozenset({'zh', 'chi', 'chinese', 'chs'}),
+    'zh-hant': frozenset({'zh-tw', 'zh-hk', 'zht', 'cht', 'tc', 'traditional'}),
+    'es': frozenset({'es', 'spa', 'spanish', 'espanol'}),
+    'fr': frozenset({'fr', 'fre', 'fra', 'french', 'francais'}),
+    'de': frozenset({'de', 'ger', 'deu', 'german', 'deutsch'}),
+    'ja': frozenset({'ja', 'jp', 'jpn', 'japanese'}),
+    'ko': frozenset({'ko', 'kr', 'kor', 'korean'}),
+    'pt': frozenset({'pt', 'por', 'portuguese'}),
+    'pt-br': frozenset({'pt-br', 'ptbr', 'pb', 'brazilian'}),
+    'ru': frozenset({'ru', 'rus', 'russian'}),
+    'ar': frozenset({'ar', 'ara', 'arabic'}),
+    'it': frozenset({'it', 'ita', 'italian'}),
+    'nl': frozenset({'nl', 'dut', 'nld', 'dutch'}),
 }
 
+# Whole words, and overlapping "word-word" pairs for hyphenated aliases
+_WORD_RE = re.compile(r'\w+')
+_HYPHENATED_RE = re.compile(r'\b(?=(\w+-\w+))')
+
 # Chinese variant mappings
 CHINESE_VARIANTS = {
     'zh-tw': 'zh-TW',    # Traditional Chinese (Taiwan)
@@ -63,8 +72,36 @@ CHINESE_VARIANTS = {
     'chs': 'zh-CN',      # Simplified Chinese alternative
 }
 
+# Region suffixes that follow a separate "zh" part
+_CHINESE_REGIONS = frozenset({'tw', 'hk', 'cn', 'sg'})
+
+# Parts that can start a Chinese variant match
+_CHINESE_TRIGGERS = frozenset(CHINESE_VARIANTS) | {'zh'}
+
 # Subtitle variant indicators (not language codes)
-SUBTITLE_VARIANTS = {'hi', 'cc', 'sdh', 'forced', 'commentary'}
+SUBTITLE_VARIANTS: FrozenSet[str] = frozenset({'hi', 'cc', 'sdh', 'forced', 'commentary'})
+
+# 3-letter codes mapped to 2-letter
+_THREE_TO_TWO: Dict[str, str] = {
+    'eng': 'en',
+    'jpn': 'ja',
+    'chi': 'zh',
+    'zho': 'zh',
+    'spa': 'es',
+    'fre': 'fr',
+    'fra': 'fr',
+    'ger': 'de',
+    'deu': 'de',
+    'ita': 'it',
+    'por': 'pt',
+    'rus': 'ru',
+    'kor': 'ko',
+    'ara': 'ar',
+    'dut': 'nl',
+    'nld': 'nl',
+}
+
+_CJK_LANGUAGES = frozenset({'zh', 'ja', 'ko'})
 
 
 def extract_languages_from_filename(filename: str) -> List[str]:
@@ -84,18 +121,22 @@ def extract_languages_from_filename(filename: str) -> List[str]:
         List of detected language codes (normalized)
     """
     filename_lower = filename.lower()
-    detected_languages = []
 
-    for lang_code, pattern in LANGUAGE_PATTERNS.items():
-        if re.search(pattern, filename_lower):
-            detected_languages.append(lang_code)
+    # Tokenize once, then every language is a set intersection
+    tokens = set(_WORD_RE.findall(filename_lower))
+    if '-' in filename_lower:
+        tokens.update(_HYPHENATED_RE.findall(filename_lower))
 
-    return detected_languages
+    return [
+        lang_code for lang_code, aliases in LANGUAGE_ALIASES.items()
+        if not aliases.isdisjoint(tokens)
+    ]
 
 
 def extract_language_from_subtitle_parts(
     filename_parts: List[str],
-    base_filename: str
+    base_filename: str,
+    lower_parts: Optional[List[str]] = None
 ) -> Optional[str]:
     """
     Extract language code from subtitle filename parts.
@@ -107,46 +148,53 @@ def extract_language_from_subtitle_parts(
     Args:
         filename_parts: Filename split by '.'
         base_filename: The base video filename (without extension)
+        lower_parts: ``filename_parts`` already lowercased, if the caller
+            has them
 
     Returns:
-        Detected language code or None
+        Detected language code or None (interned, so a bulk scan keeps one
+        copy of each code)
     """
     if len(filename_parts) <= 1:
         return None
 
-    # First check for Chinese variants (more specific patterns)
-    for i in range(len(filename_parts)):
-        current_part = filename_parts[i].lower()
-        next_part = filename_parts[i + 1].lower() if i + 1 < len(filename_parts) else ""
-
-        # Pattern: "zh-tw", "zht", etc. (combined)
-        if current_part in CHINESE_VARIANTS:
-            return CHINESE_VARIANTS[current_part]
-
-        # Pattern: "zh" + "tw" as separate parts
-        if current_part == 'zh' and next_part in ['tw', 'hk', 'cn', 'sg']:
-            return f'zh-{next_part.upper()}'
-
-    # Look for standard language codes
-    for part in reversed(filename_parts[1:]):  # Skip the base filename part
-        part_lower = part.lower()
-
-        # Check if it's a known language code (2-3 letters)
-        if len(part_lower) in [2, 3] and part_lower in KNOWN_LANGUAGE_CODES:
-            return part_lower
+    # Lowercase once; every check below is a hash lookup
+    if lower_parts is None:
+        lower_parts = [part.lower() for part in filename_parts]
+
+    # First check for Chinese variants (more specific patterns). Most files
+    # have none, and one set test rules that out without walking the parts;
+    # otherwise the walk keeps the first match in filename order
+    if not _CHINESE_TRIGGERS.isdisjoint(lower_parts):
+        for current_part, next_part in zip(lower_parts, lower_parts[1:] + ['']):
+            # Pattern: "zh-tw", "zht", etc. (combined)
+            variant = CHINESE_VARIANTS.get(current_part)
+            if variant:
+                return variant
+
+            # Pattern: "zh" + "tw" as separate parts
+            if current_part == 'zh' and next_part in _CHINESE_REGIONS:
+                return sys.intern(f'zh-{next_part.upper()}')
+
+    # Look for standard language codes (2-3 letters), skipping the base
+    # filename part
+    for part_lower in reversed(lower_parts[1:]):
+        if part_lower in _SHORT_LANGUAGE_CODES:
+            return sys.intern(part_lower)
 
     # Fallback: try the last part if it looks like a language code
-    last_part = filename_parts[-1].lower()
+    last_part = lower_parts[-1]
     if (
-        len(last_part) in [2, 3] and
+        len(last_part) in (2, 3) and
         last_part.isalpha() and
         last_part not in SUBTITLE_VARIANTS
     ):
-        return last_part
+        return sys.intern(last_part)
 
     return None
 
 
+@functools.lru_cache(maxsize=256)
 def normalize_language_code(code: str) -> str:
     """
     Normalize a language code to standard format.
@@ -160,33 +208,13 @@ def normalize_language_code(code: str) -> str:
         code: The language code to normalize
 
     Returns:
-        Normalized language code
+        Normalized language code (interned)
     """
     code = code.lower().strip()
-
-    # Map 3-letter codes to 2-letter
-    three_to_two = {
-        'eng': 'en',
-        'jpn': 'ja',
-        'chi': 'zh',
-        'zho': 'zh',
-        'spa': 'es',
-        'fre': 'fr',
-        'fra': 'fr',
-        'ger': 'de',
-        'deu': 'de',
-        'ita': 'it',
-        'por': 'pt',
-        'rus': 'ru',
-        'kor': 'ko',
-        'ara': 'ar',
-        'dut': 'nl',
-        'nld': 'nl',
-    }
-
-    return three_to_two.get(code, code)
+    return _THREE_TO_TWO.get(code) or sys.intern(code)
 
 
+@functools.lru_cache(maxsize=256)
 def is_cjk_language(code: str) -> bool:
     """
     Check if a language code represents a CJK (Chinese, Japanese, Korean) language.
@@ -198,4 +226,4 @@ def is_cjk_language(code: str) -> bool:
         True if CJK language
     """
     normalized = normalize_language_code(code)
-    return normalized in {'zh', 'ja', 'ko'} or code.startswith('zh-')
+    return normalized in _CJK_LANGUAGES or code.startswith('zh-')
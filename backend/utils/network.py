@@ -2,12 +2,52 @@
 Network utilities for IP detection and CORS validation
 """
 
+import functools
+import ipaddress
+import re
 import socket
+import struct
+import time
 import logging
-from typing import List
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
 
 logger = logging.getLogger(__name__)
 
+# Local-network origin pattern, compiled once at import. Accepts the same
+# hosts as is_local_origin(), written the way browsers serialize origins
+# (lowercase, IPv6 compressed and in brackets)
+_OCTET = r"(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)"
+# 127.0.0.0/8, 10.0.0.0/8, 192.168.0.0/16 and 172.16.0.0/12
+_LOCAL_IPV4 = rf"(127\.{_OCTET}|10\.{_OCTET}|192\.168|172\.(1[6-9]|2\d|3[01]))(\.{_OCTET}){{2}}"
+_CORS_REGEX = (
+    r"^https?://("
+    r"localhost|"
+    rf"{_LOCAL_IPV4}|"
+    r"([^./:\[\]]+\.)+local|"
+    r"\[::1\]|"
+    r"\[f[cd][0-9a-f]{2}(:[0-9a-f]{0,4}){1,7}\]|"  # fc00::/7
+    # IPv4-mapped local addresses, dotted or in hex (::ffff:c0a8:101)
+    rf"\[::ffff:({_LOCAL_IPV4}|(7f[0-9a-f]{{2}}|a[0-9a-f]{{2}}|c0a8|ac1[0-9a-f]):[0-9a-f]{{1,4}})\]"
+    r")(:\d+)?$"
+)
+_CORS_PATTERN = re.compile(_CORS_REGEX)
+
+
+# Seconds a detected local IP is reused before the route is looked up again
+LOCAL_IP_TTL_SECONDS = 300
+
+# (ip, expires_at on the monotonic clock); only successful lookups are stored
+_local_ip_cache: Optional[Tuple[str, float]] = None
+
+
+def _detect_local_ip() -> str:
+    # Create a socket connection to determine local IP
+    # This doesn't actually connect but helps determine the route
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.connect(("8.8.8.8", 80))
+        return s.getsockname()[0]
+
 
 def get_local_ip() -> str:
     """
@@ -15,31 +55,50 @@ def get_local_ip() -> str:
 
     Uses a UDP socket connection to determine the outbound IP address.
     This doesn't actually send any data, just determines the route.
+    A successful result is reused for LOCAL_IP_TTL_SECONDS, so a network
+    change is picked up without a restart; clear_local_ip_cache() forces
+    a new lookup sooner.
 
     Returns:
         str: Local IP address or "127.0.0.1" if detection fails
     """
+    global _local_ip_cache
+
+    cached = _local_ip_cache
+    now = time.monotonic()
+    if cached is not None and now < cached[1]:
+        return cached[0]
+
     try:
-        # Create a socket connection to determine local IP
-        # This doesn't actually connect but helps determine the route
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-            s.connect(("8.8.8.8", 80))
-            local_ip = s.getsockname()[0]
-            return local_ip
+        local_ip = _detect_local_ip()
     except Exception as e:
         logger.warning(f"Failed to detect local IP: {e}")
         return "127.0.0.1"
 
+    _local_ip_cache = (local_ip, now + LOCAL_IP_TTL_SECONDS)
+    return local_ip
+
+
+def clear_local_ip_cache() -> None:
+    """Forget the cached local IP so the next call detects it again"""
+    global _local_ip_cache
+    _local_ip_cache = None
+
 
 def is_local_origin(origin: str) -> bool:
     """
     Check if an origin is from the local network.
 
     Validates against:
-    - localhost / 127.0.0.1
-    - RFC 1918 private ranges (192.168.x.x, 10.x.x.x, 172.16.x.x)
+    - localhost / 127.0.0.0/8
+    - RFC 1918 private ranges (192.168.x.x, 10.x.x.x, 172.16-31.x.x)
+    - IPv6 loopback (::1) and unique local addresses (fc00::/7)
     - .local domain suffix
 
+    IPv4 hosts are packed to a 32-bit int once and checked with masked
+    compares, so a host like "192.168.1.1.example.com" no longer passes a
+    prefix test.
+
     Args:
         origin: The origin URL to check (e.g., "http://192.168.1.100:5173")
 
@@ -54,88 +113,124 @@ def is_local_origin(origin: str) -> bool:
         logger.debug("Allowing 'null' origin (file:// or redirect)")
         return True
 
+    if "://" not in origin:
+        return False
+
     try:
-        # Extract host from origin URL
-        if "://" in origin:
-            host_part = origin.split("://")[1].split(":")[0].split("/")[0]
+        host = urlsplit(origin).hostname or ""
+    except ValueError as e:
+        logger.warning(f"Failed to parse origin '{origin}': {e}")
+        return False
 
-            # Check against allowed patterns
-            is_local = (
-                host_part in ["localhost", "127.0.0.1"] or
-                host_part.startswith("192.168.") or
-                host_part.startswith("10.") or
-                _is_172_private(host_part) or
-                host_part.endswith(".local")
-            )
+    if host == "localhost" or host.endswith(".local"):
+        return True
 
-            return is_local
+    # urlsplit strips the brackets from "[::1]"; only IPv6 hosts have ':'
+    if ":" in host:
+        return _is_local_ipv6(host)
+
+    ip = _ipv4_to_int(host)
+    return ip is not None and _is_local_ipv4(ip)
+
+
+def _is_local_ipv4(ip: int) -> bool:
+    """
+    Check a packed IPv4 address against loopback and RFC 1918 ranges.
+    """
+    return (
+        (ip & 0xFF000000) == 0x7F000000 or  # 127.0.0.0/8
+        (ip & 0xFF000000) == 0x0A000000 or  # 10.0.0.0/8
+        (ip & 0xFFFF0000) == 0xC0A80000 or  # 192.168.0.0/16
+        (ip & 0xFFF00000) == 0xAC100000     # 172.16.0.0/12
+    )
 
-    except Exception as e:
-        logger.warning(f"Failed to parse origin '{origin}': {e}")
 
-    return False
+# IPv6 counterpart of the RFC 1918 ranges. ipaddress's is_private is not
+# used: it also covers link-local, documentation and all IPv4-mapped ranges
+_IPV6_UNIQUE_LOCAL = ipaddress.IPv6Network("fc00::/7")
 
 
-def _is_172_private(host: str) -> bool:
+def _is_local_ipv6(host: str) -> bool:
     """
-    Check if host is in the 172.16.0.0 - 172.31.255.255 private range.
+    Check an IPv6 host for loopback or unique local addresses.
     """
-    if not host.startswith("172."):
+    try:
+        ip = ipaddress.IPv6Address(host)
+    except ValueError:
         return False
 
+    if ip.ipv4_mapped is not None:
+        return _is_local_ipv4(int(ip.ipv4_mapped))
+    return ip.is_loopback or ip in _IPV6_UNIQUE_LOCAL
+
+
+def _ipv4_to_int(host: str) -> Optional[int]:
+    """
+    Pack a dotted-quad IPv4 host into an int, or None if it isn't one.
+    """
+    # inet_aton tolerates trailing junk after whitespace and shorthand like
+    # "10.1"; only accept four dotted numbers
+    if host.count(".") != 3 or not host.replace(".", "").isdigit():
+        return None
     try:
-        parts = host.split(".")
-        if len(parts) >= 2:
-            second_octet = int(parts[1])
-            return 16 <= second_octet <= 31
-    except (ValueError, IndexError):
-        pass
+        return struct.unpack("!I", socket.inet_aton(host))[0]
+    except (OSError, ValueError):
+        return None
+
 
-    return False
+_CORS_PORTS = (3000, 5173, 8080)
 
 
-def get_cors_origins(local_ip: str) -> List[str]:
+def get_cors_origins(local_ip: Optional[str] = None) -> Tuple[str, ...]:
     """
-    Generate list of allowed CORS origins based on local IP.
+    Generate the allowed CORS origins based on local IP.
+
+    Results are cached per IP and returned as an immutable tuple.
 
     Args:
-        local_ip: The detected local IP address
+        local_ip: The detected local IP address (defaults to get_local_ip())
 
     Returns:
-        List of allowed origin URLs
+        Tuple of allowed origin URLs
     """
-    ports = [3000, 5173, 8080]
-    hosts = ["localhost", "127.0.0.1", local_ip]
+    if local_ip is None:
+        local_ip = get_local_ip()
+    return _cors_origins(local_ip)
 
-    origins = []
-    for host in hosts:
-        for port in ports:
-            origins.append(f"http://{host}:{port}")
 
-    return origins
+@functools.lru_cache(maxsize=8)
+def _cors_origins(local_ip: str) -> Tuple[str, ...]:
+    return tuple(
+        f"http://{host}:{port}"
+        for host in ("localhost", "127.0.0.1", local_ip)
+        for port in _CORS_PORTS
+    )
 
 
 def get_cors_regex() -> str:
     """
     Get regex pattern for CORS origin validation.
 
-    Matches:
-    - localhost
-    - 127.0.0.1
-    - 192.168.x.x
-    - 10.x.x.x
-    - 172.16-31.x.x
+    Matches the same origins as is_local_origin() (except "null"):
+    - localhost / 127.0.0.0/8
+    - 192.168.x.x, 10.x.x.x, 172.16-31.x.x
+    - IPv6 loopback, unique local and IPv4-mapped local addresses
     - *.local
 
     Returns:
         Regex pattern string for FastAPI CORSMiddleware
     """
-    return (
-        r"^https?://"
-        r"(localhost|127\.0\.0\.1|"
-        r"192\.168\.\d+\.\d+|"
-        r"10\.\d+\.\d+\.\d+|"
-        r"172\.(1[6-9]|2[0-9]|3[01])\.\d+\.\d+|"
-        r"[^.]+\.local)"
-        r"(:\d+)?$"
-    )
+    return _CORS_REGEX
+
+
+def get_cors_pattern() -> "re.Pattern[str]":
+    """
+    Get the compiled CORS origin pattern.
+
+    Same pattern as get_cors_regex(), compiled once at import so callers
+    matching origins themselves don't recompile it.
+
+    Returns:
+        Compiled regex pattern
+    """
+    return _CORS_PATTERN
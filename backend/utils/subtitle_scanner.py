@@ -4,11 +4,13 @@ Subtitle file scanner utility
 Scans directories for subtitle files and extracts metadata like language codes.
 """
 
+import functools
 import logging
-from pathlib import Path
-from typing import List, Dict, Optional
+import os
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
 from dataclasses import dataclass
 
+from .compat import DATACLASS_SLOTS
 from .language import (
     extract_language_from_subtitle_parts,
     CHINESE_VARIANTS,
@@ -19,10 +21,14 @@ from .language import (
 logger = logging.getLogger(__name__)
 
 # Supported subtitle file extensions
-SUBTITLE_EXTENSIONS = {'.srt', '.ass', '.ssa', '.vtt', '.sub'}
+SUBTITLE_EXTENSIONS: FrozenSet[str] = frozenset({'.srt', '.ass', '.ssa', '.vtt', '.sub'})
+# Sorted so the order does not depend on string hashing
+_SUBTITLE_EXTENSIONS_TUPLE = tuple(sorted(SUBTITLE_EXTENSIONS))
+# Characters that may follow the video name in a subtitle file name
+_NAME_SEPARATORS = frozenset('._- ')
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class SubtitleFileInfo:
     """Information about an external subtitle file."""
     file_path: str
@@ -59,27 +65,41 @@ def scan_directory_for_subtitles(
         List of SubtitleFileInfo objects for found subtitles
     """
     subtitles: List[SubtitleFileInfo] = []
+    base_len = len(base_filename)
 
     try:
-        dir_path = Path(directory)
-        if not dir_path.exists():
-            logger.debug(f"Directory does not exist: {directory}")
-            return subtitles
-
-        for file in dir_path.iterdir():
-            if not file.is_file():
-                continue
-
-            if file.suffix.lower() not in SUBTITLE_EXTENSIONS:
-                continue
-
-            # Check if this subtitle belongs to our video
-            if not file.stem.startswith(base_filename):
-                continue
-
-            subtitle_info = parse_subtitle_filename(file, base_filename)
-            if subtitle_info:
-                subtitles.append(subtitle_info)
+        # The scan is readdir-driven: no entry is ever stat()ed for size or
+        # mtime, and only names that pass the string checks below are parsed
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+
+                # Check if this subtitle belongs to our video before any
+                # other work. The name must continue with a separator, so
+                # "Movie_en.srt" matches but "S01E010" is not "S01E01"
+                if not name.startswith(base_filename):
+                    continue
+                if name[base_len:base_len + 1] not in _NAME_SEPARATORS:
+                    continue
+
+                # Same suffix split as pathlib
+                dot = name.rfind('.')
+                if not 0 < dot < len(name) - 1:
+                    continue
+                if name[dot:].lower() not in SUBTITLE_EXTENSIONS:
+                    continue
+
+                # Answered from the cached dirent type without a syscall;
+                # only symlinks are stat()ed, so linked subtitles still count
+                if not entry.is_file():
+                    continue
+
+                subtitle_info = parse_subtitle_filename(entry.path, base_filename)
+                if subtitle_info:
+                    subtitles.append(subtitle_info)
+
+    except FileNotFoundError:
+        logger.debug(f"Directory does not exist: {directory}")
 
     except (OSError, PermissionError) as e:
         logger.warning(f"Error scanning directory {directory}: {e}")
@@ -88,7 +108,7 @@ def scan_directory_for_subtitles(
 
 
 def parse_subtitle_filename(
-    file_path: Path,
+    file_path: Union[str, os.PathLike],
     base_filename: str
 ) -> Optional[SubtitleFileInfo]:
     """
@@ -100,31 +120,24 @@ def parse_subtitle_filename(
     - ShowName.S01E01.dual.ja.en.ass
 
     Args:
-        file_path: Path to the subtitle file
+        file_path: Path to the subtitle file (kept as given in file_path)
         base_filename: Base filename of the video
 
     Returns:
         SubtitleFileInfo or None if parsing fails
     """
     try:
-        filename = file_path.stem
-        parts = filename.split('.')
-
-        # Detect dual subtitle
-        is_dual, dual_languages = detect_dual_subtitle(parts)
-
-        # Extract language code (unless it's a dual subtitle)
-        language_code = None
-        if not is_dual:
-            language_code = _extract_language_code(parts)
+        path_str = os.fspath(file_path)
+        name = os.path.basename(path_str)
+        language_code, file_format, is_dual, dual_languages = _parse_name(name)
 
         return SubtitleFileInfo(
-            file_path=str(file_path),
-            file_name=file_path.name,
+            file_path=path_str,
+            file_name=name,
             language_code=language_code,
-            format=file_path.suffix[1:].upper(),
+            format=file_format,
             is_dual_subtitle=is_dual,
-            dual_languages=dual_languages,
+            dual_languages=list(dual_languages) if dual_languages else None,
         )
 
     except Exception as e:
@@ -132,7 +145,45 @@ def parse_subtitle_filename(
         return None
 
 
-def detect_dual_subtitle(parts: List[str]) -> tuple[bool, Optional[List[str]]]:
+@functools.lru_cache(maxsize=4096)
+def _parse_name(
+    name: str
+) -> Tuple[Optional[str], str, bool, Optional[Tuple[str, ...]]]:
+    """
+    Parse a subtitle file name into (language_code, format, is_dual,
+    dual_languages). Memoized: repeat scans of a library see the same names.
+    """
+    # Same suffix/stem split as pathlib, without building Paths
+    dot = name.rfind('.')
+    if 0 < dot < len(name) - 1:
+        filename, suffix = name[:dot], name[dot:]
+    else:
+        filename, suffix = name, ''
+    parts = filename.split('.')
+    # Lowercased once and shared by every helper below
+    lower_parts = [p.lower() for p in parts]
+
+    # Detect dual subtitle
+    is_dual, dual_languages = detect_dual_subtitle(parts, lower_parts)
+
+    # Extract language code (unless it's a dual subtitle)
+    language_code = None
+    if not is_dual:
+        language_code = _extract_language_code(parts, lower_parts)
+
+    # Tuple, not list: the cached result is shared between calls
+    return (
+        language_code,
+        suffix[1:].upper(),
+        is_dual,
+        tuple(dual_languages) if dual_languages else None,
+    )
+
+
+def detect_dual_subtitle(
+    parts: List[str],
+    lower_parts: Optional[List[str]] = None
+) -> tuple[bool, Optional[List[str]]]:
     """
     Detect if a subtitle file is a dual subtitle and extract languages.
 
@@ -140,35 +191,33 @@ def detect_dual_subtitle(parts: List[str]) -> tuple[bool, Optional[List[str]]]:
 
     Args:
         parts: Filename split by '.'
+        lower_parts: ``parts`` already lowercased, if the caller has them
 
     Returns:
         Tuple of (is_dual, languages_list)
     """
-    # Check if 'dual' is in the filename
-    lower_parts = [p.lower() for p in parts]
-    if 'dual' not in lower_parts:
-        return False, None
-
+    # Find 'dual' in one pass over the lowercased parts
+    if lower_parts is None:
+        lower_parts = [p.lower() for p in parts]
     try:
         dual_index = lower_parts.index('dual')
+    except ValueError:
+        return False, None
 
-        # Need at least 2 parts after 'dual' for language codes
-        if dual_index + 2 < len(parts):
-            lang1 = parts[dual_index + 1]
-            lang2 = parts[dual_index + 2]
-
-            # Validate they look like language codes
-            if _looks_like_language_code(lang1) and _looks_like_language_code(lang2):
-                return True, [lang1, lang2]
+    # Need at least 2 parts after 'dual' for language codes
+    if dual_index + 2 < len(parts):
+        lang1 = parts[dual_index + 1]
+        lang2 = parts[dual_index + 2]
 
-    except (ValueError, IndexError):
-        pass
+        # Validate they look like language codes
+        if _looks_like_language_code(lang1) and _looks_like_language_code(lang2):
+            return True, [lang1, lang2]
 
     # It has 'dual' but we couldn't extract languages
     return True, None
 
 
-def _extract_language_code(parts: List[str]) -> Optional[str]:
+def _extract_language_code(parts: List[str], lower_parts: List[str]) -> Optional[str]:
     """
     Extract language code from filename parts.
 
@@ -178,12 +227,12 @@ def _extract_language_code(parts: List[str]) -> Optional[str]:
         return None
 
     # First try using the centralized function
-    result = extract_language_from_subtitle_parts(parts, parts[0])
+    result = extract_language_from_subtitle_parts(parts, parts[0], lower_parts)
     if result:
         return result
 
     # Fallback: check last part if it looks like a language code
-    last_part = parts[-1].lower()
+    last_part = lower_parts[-1]
     if _looks_like_language_code(last_part) and last_part not in SUBTITLE_VARIANTS:
         return last_part
 
@@ -208,6 +257,6 @@ def _looks_like_language_code(s: str) -> bool:
     )
 
 
-def get_subtitle_extensions() -> List[str]:
-    """Get list of supported subtitle file extensions."""
-    return list(SUBTITLE_EXTENSIONS)
+def get_subtitle_extensions() -> Tuple[str, ...]:
+    """Get the supported subtitle file extensions (a shared, sorted tuple)."""
+    return _SUBTITLE_EXTENSIONS_TUPLE